@@ -32,24 +32,111 @@ Usage:
     python compare_audio.py "reference_sfx_%d.wav" "output_sfx_%d.wav"
 """
 
+import hashlib
+import os
 import sys
 import numpy as np
+import scipy.fft
+import scipy.sparse
 import wave
 import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
 # PICO-8 audio constants
 FRAME_SIZE = 16 * 183  # 2928 samples per frame (16 notes at 183 samples per note @ 22.05kHz)
 NUM_SFX = 64
 NUM_FREQUENCIES = 96  # PICO-8 note range 0-95
+SAMPLE_RATE = 22050  # PICO-8 export sample rate
+
+# Frequencies for all PICO-8 notes, computed once as a single vector power
+_PICO8_FREQS = 440.0 * np.exp2((np.arange(NUM_FREQUENCIES, dtype=np.float64) - 33.0) / 12.0)
 
 def pico8_note_to_freq(note):
     """Convert PICO-8 note index (0-95) to frequency in Hz"""
-    return 440.0 * (2.0 ** ((note - 33.0) / 12.0))
+    return _PICO8_FREQS[note]
+
+# The window and the note->FFT-bin mapping only depend on FRAME_SIZE and
+# SAMPLE_RATE, so build them once at import instead of per frame.
+_HANN = np.hanning(FRAME_SIZE).astype(np.float32)
+
+# Thread count for scipy.fft: use all cores when running serially, but only
+# one inside process pool workers to avoid oversubscription.
+_FFT_WORKERS = -1
+
+# Zero-pad each frame up to a small-prime-factor length; pocketfft runs a
+# much faster kernel on 3000 = 2^3*3*5^3 than on 2928 = 2^4*3*61
+_FFT_N = scipy.fft.next_fast_len(FRAME_SIZE, real=True)
+def _build_note_weights(sample_rate):
+    """Build a sparse (NUM_FREQUENCIES, num_bins) matrix of triangular
+    weights around each note's FFT bin, so the per-note intensity is a
+    windowed sum over nearby bins (one sparse matmul) rather than a single
+    nearest-bin sample"""
+    num_bins = _FFT_N // 2 + 1
+    centers = _PICO8_FREQS * _FFT_N / sample_rate
+    # rFFT bins are uniformly spaced, so rounding the fractional bin index
+    # is an O(1) nearest-bin lookup; no search over fft_freqs is needed
+    nearest_bins = np.clip(np.rint(centers).astype(np.int64), 0, num_bins - 1)
+    # Extrapolate virtual neighbours at both ends so every note has a
+    # left/right spacing to derive its window from
+    left = np.concatenate(([2 * centers[0] - centers[1]], centers[:-1]))
+    right = np.concatenate((centers[1:], [2 * centers[-1] - centers[-2]]))
+    # Half the distance to the neighbouring notes, but never narrower
+    # than one bin so the nearest bin always contributes
+    widths = np.maximum((right - left) / 4.0, 1.0)
+    # One broadcast builds all 96 triangular windows at once; bins at or
+    # beyond each window's edge come out <= 0 and are dropped below
+    weights = 1.0 - np.abs(np.arange(num_bins) - centers[:, None]) / widths[:, None]
+    np.maximum(weights, 0.0, out=weights)
+    totals = weights.sum(axis=1)
+    # Degenerate windows: fall back to the nearest bin
+    degenerate = totals == 0.0
+    if degenerate.any():
+        weights[degenerate, nearest_bins[degenerate]] = 1.0
+        totals[degenerate] = 1.0
+    # Normalize so a single-bin window reduces to the old nearest-bin
+    # behaviour and intensities stay on the same scale
+    weights /= totals[:, None]
+    return scipy.sparse.csr_matrix(weights, dtype=np.float32)
+
+# Weight matrices are cached per sample rate so files that are not at the
+# PICO-8 export rate still map to the right bins, built at most once each
+_NOTE_WEIGHTS_CACHE = {}
+
+def _note_weights(sample_rate):
+    weights = _NOTE_WEIGHTS_CACHE.get(sample_rate)
+    if weights is None:
+        weights = _NOTE_WEIGHTS_CACHE[sample_rate] = _build_note_weights(sample_rate)
+    return weights
 
 def read_wav(filename):
     """Read WAV file and return samples as numpy array"""
+    if soundfile is not None:
+        # libsndfile decodes straight to float32 in C, avoiding the
+        # intermediate integer buffer and Python-side scaling below.
+        try:
+            data, framerate = soundfile.read(filename, dtype='float32')
+        except Exception as e:
+            if not Path(filename).exists():
+                return None, None
+            print(f"Error reading {filename}: {e}")
+            return None, None
+        # Handle stereo by taking first channel; mono comes back 1-D and
+        # needs no slicing or copy
+        if data.ndim == 2:
+            data = np.ascontiguousarray(data[:, 0])
+        return data, framerate
+
     try:
         with wave.open(filename, 'rb') as wav:
             n_channels = wav.getnchannels()
@@ -70,9 +157,11 @@ def read_wav(filename):
             else:
                 raise ValueError(f"Unsupported sample width: {sampwidth}")
 
-            # Handle stereo by taking first channel
+            # Handle stereo by taking first channel; materialize the slice
+            # now so downstream FFT/reshape code gets a contiguous buffer
+            # instead of silently copying a strided view on every use
             if n_channels == 2:
-                samples = samples[::2]
+                samples = np.ascontiguousarray(samples.reshape(-1, 2)[:, 0])
 
             return samples, framerate
     except FileNotFoundError:
@@ -81,117 +170,284 @@ def read_wav(filename):
         print(f"Error reading {filename}: {e}")
         return None, None
 
-def calculate_frame_amplitude(frame):
-    """Calculate RMS amplitude of a frame"""
-    return np.sqrt(np.mean(frame ** 2))
-
 def calculate_frame_spectrum(frame, sample_rate):
     """
     Calculate frequency spectrum for PICO-8 note frequencies.
     Returns intensity at each of the 96 PICO-8 note frequencies.
     """
     # Apply window to reduce spectral leakage
-    windowed = frame * np.hanning(len(frame))
+    windowed = frame * _HANN
 
     # FFT
-    fft = np.fft.rfft(windowed)
-    fft_freqs = np.fft.rfftfreq(len(frame), 1.0 / sample_rate)
-    fft_mag = np.abs(fft)
+    fft_mag = np.abs(scipy.fft.rfft(windowed, n=_FFT_N))
 
-    # Calculate intensity at each PICO-8 note frequency
-    spectrum = np.zeros(NUM_FREQUENCIES)
-    for note_idx in range(NUM_FREQUENCIES):
-        target_freq = pico8_note_to_freq(note_idx)
-
-        # Find nearest FFT bin
-        bin_idx = np.argmin(np.abs(fft_freqs - target_freq))
-
-        # Use magnitude at that bin (could also sum nearby bins for better accuracy)
-        spectrum[note_idx] = fft_mag[bin_idx]
-
-    return spectrum
+    # Windowed sum of the bins around each PICO-8 note frequency
+    return _note_weights(sample_rate).dot(fft_mag)
 
 def analyze_wav(samples, sample_rate):
     """
     Analyze WAV file samples.
     Returns:
-        - amplitudes: list of RMS amplitude per frame
+        - amplitudes: array of RMS amplitude per frame
         - spectra: 2D array of frequency intensities (frames × frequencies)
     """
     if samples is None or len(samples) == 0:
-        return [], np.array([])
-
+        return (np.empty(0, dtype=np.float32),
+                np.empty((0, NUM_FREQUENCIES), dtype=np.float32))
+
+    # Pin the whole pipeline to float32: read_wav already delivers float32,
+    # but a float64 caller would otherwise promote the window product, the
+    # FFT and every diff downstream to double the bandwidth
+    samples = np.asarray(samples, dtype=np.float32)
+
+    # Batch all frames into a (num_frames, FRAME_SIZE) array so the window,
+    # FFT and RMS reduction each run once over the whole SFX instead of
+    # per frame. A partial tail frame is zero-padded in rather than dropped.
+    tail = len(samples) % FRAME_SIZE
+    if tail:
+        samples = np.pad(samples, (0, FRAME_SIZE - tail))
     num_frames = len(samples) // FRAME_SIZE
-    amplitudes = []
-    spectra = []
-
-    for frame_idx in range(num_frames):
-        start = frame_idx * FRAME_SIZE
-        end = start + FRAME_SIZE
-        frame = samples[start:end]
-
-        if len(frame) < FRAME_SIZE:
-            # Pad last frame if needed
-            frame = np.pad(frame, (0, FRAME_SIZE - len(frame)), mode='constant')
-
-        amp = calculate_frame_amplitude(frame)
-        spec = calculate_frame_spectrum(frame, sample_rate)
-
-        amplitudes.append(amp)
-        spectra.append(spec)
-
-    return amplitudes, np.array(spectra)
+    frames = samples.reshape(num_frames, FRAME_SIZE)
+    # RMS per frame as one row-wise dot product, with no frames**2 temporary
+    if _rms_per_row is not None:
+        amplitudes = _rms_per_row(frames)
+    else:
+        amplitudes = np.sqrt(np.einsum('ij,ij->i', frames, frames) / FRAME_SIZE)
+
+    # Silent frames (trailing silence is common in short SFX) contribute
+    # nothing to the spectrum, so only audible frames go through the FFT
+    # and the rest stay exactly zero
+    audible = amplitudes > 1e-5
+    spectra = np.zeros((num_frames, NUM_FREQUENCIES), dtype=np.float32)
+    if audible.any():
+        active = frames if audible.all() else frames[audible]
+        # scipy.fft keeps float32 input in float32/complex64; np.fft would
+        # silently promote the whole transform to float64
+        # overwrite_x is safe: active * _HANN is a fresh temporary
+        fft_mag = np.abs(scipy.fft.rfft(active * _HANN, n=_FFT_N, axis=1,
+                                        workers=_FFT_WORKERS, overwrite_x=True))
+        spectra[audible] = _note_weights(sample_rate).dot(fft_mag.T).T
+
+    return amplitudes, spectra
+
+if numba is not None:
+    @numba.njit(cache=True, parallel=True, fastmath=True)
+    def _rms_per_row(frames):
+        """Per-frame RMS as a single pass over each row, with no squared
+        temporary array"""
+        n, m = frames.shape
+        out = np.empty(n, dtype=np.float32)
+        for i in numba.prange(n):
+            s = 0.0
+            for j in range(m):
+                s += frames[i, j] * frames[i, j]
+            out[i] = np.sqrt(s / m)
+        return out
+
+    @numba.njit(cache=True, parallel=True, fastmath=True)
+    def _diff_stats(ref_amps, out_amps, ref_specs, out_specs):
+        """Fused pad/diff/abs/mean kernel: one pass over the amplitudes and
+        one parallel pass over the spectra, with no temporary arrays"""
+        n_ref = ref_amps.shape[0]
+        n_out = out_amps.shape[0]
+        max_frames = max(n_ref, n_out)
+        n_freq = ref_specs.shape[1]
+
+        amp_diffs = np.empty(max_frames, dtype=np.float32)
+        amp_sum = 0.0
+        amp_sum_nz = 0.0
+        nz_count = 0
+        for i in range(max_frames):
+            r = ref_amps[i] if i < n_ref else np.float32(0.0)
+            o = out_amps[i] if i < n_out else np.float32(0.0)
+            d = abs(r - o)
+            amp_diffs[i] = d
+            amp_sum += d
+            if r > 0.0:
+                nz_count += 1
+                amp_sum_nz += d
+
+        n_ref_spec = ref_specs.shape[0]
+        n_out_spec = out_specs.shape[0]
+        spec_diffs = np.empty((max_frames, n_freq), dtype=np.float32)
+        spec_sum = 0.0
+        spec_sum_nz = 0.0
+        for i in numba.prange(max_frames):
+            row_sum = 0.0
+            for j in range(n_freq):
+                r = ref_specs[i, j] if i < n_ref_spec else np.float32(0.0)
+                o = out_specs[i, j] if i < n_out_spec else np.float32(0.0)
+                d = abs(r - o)
+                spec_diffs[i, j] = d
+                row_sum += d
+            spec_sum += row_sum
+            if i < n_ref and ref_amps[i] > 0.0:
+                spec_sum_nz += row_sum
+
+        mean_amp = amp_sum / max_frames
+        mean_spec = spec_sum / (max_frames * n_freq)
+        mean_amp_nz = amp_sum_nz / nz_count if nz_count > 0 else 0.0
+        mean_spec_nz = spec_sum_nz / (nz_count * n_freq) if nz_count > 0 else 0.0
+        return amp_diffs, spec_diffs, mean_amp, mean_spec, mean_amp_nz, mean_spec_nz
+else:
+    _rms_per_row = None
+    _diff_stats = None
 
 def calculate_differences(ref_amps, ref_specs, out_amps, out_specs):
     """Calculate amplitude and spectrum differences"""
-    # Pad shorter sequence to match longer one
+    if _diff_stats is not None and np.size(ref_specs) > 0 and np.size(out_specs) > 0:
+        return _diff_stats(np.ascontiguousarray(ref_amps, dtype=np.float32),
+                           np.ascontiguousarray(out_amps, dtype=np.float32),
+                           np.ascontiguousarray(ref_specs, dtype=np.float32),
+                           np.ascontiguousarray(out_specs, dtype=np.float32))
+
+    # Pad shorter sequence to match longer one, writing into preallocated
+    # float32 buffers and diffing in place instead of allocating a fresh
+    # array per pad/subtract/abs step
     max_frames = max(len(ref_amps), len(out_amps))
 
-    ref_amps_padded = np.pad(ref_amps, (0, max_frames - len(ref_amps)), mode='constant')
-    out_amps_padded = np.pad(out_amps, (0, max_frames - len(out_amps)), mode='constant')
+    amp_diffs = np.zeros(max_frames, dtype=np.float32)
+    amp_diffs[:len(ref_amps)] = ref_amps
 
-    # Amplitude differences
-    amp_diffs = np.abs(ref_amps_padded - out_amps_padded)
+    # Non-zero reference frames (taken before the buffer is diffed in place)
+    non_zero_mask = amp_diffs > 0
+    non_zero_count = non_zero_mask.sum()
+
+    # Amplitude differences: subtracting into the zero-padded slice stands
+    # in for padding the shorter array
+    amp_diffs[:len(out_amps)] -= out_amps
+    np.abs(amp_diffs, out=amp_diffs)
     mean_amp_diff = np.mean(amp_diffs)
 
     # Amplitude differences for non-zero reference frames only
-    non_zero_mask = ref_amps_padded > 0
-    if np.any(non_zero_mask):
-        mean_amp_diff_nonzero = np.mean(amp_diffs[non_zero_mask])
-    else:
-        mean_amp_diff_nonzero = 0.0
+    # (boolean-weighted mean avoids the fancy-index copy)
+    mean_amp_diff_nonzero = (amp_diffs * non_zero_mask).sum() / max(non_zero_count, 1)
 
     # Spectrum differences
     if ref_specs.size > 0 and out_specs.size > 0:
-        # Pad spectrum arrays
-        ref_specs_padded = np.pad(ref_specs, ((0, max_frames - ref_specs.shape[0]), (0, 0)), mode='constant')
-        out_specs_padded = np.pad(out_specs, ((0, max_frames - out_specs.shape[0]), (0, 0)), mode='constant')
-
-        spec_diffs = np.abs(ref_specs_padded - out_specs_padded)
+        spec_diffs = np.zeros((max_frames, NUM_FREQUENCIES), dtype=np.float32)
+        spec_diffs[:ref_specs.shape[0]] = ref_specs
+        spec_diffs[:out_specs.shape[0]] -= out_specs
+        np.abs(spec_diffs, out=spec_diffs)
         mean_spec_diff = np.mean(spec_diffs)
 
         # Spectrum differences for non-zero reference frames only
-        if np.any(non_zero_mask):
-            mean_spec_diff_nonzero = np.mean(spec_diffs[non_zero_mask])
-        else:
-            mean_spec_diff_nonzero = 0.0
+        mean_spec_diff_nonzero = (spec_diffs * non_zero_mask[:, None]).sum() / max(non_zero_count * NUM_FREQUENCIES, 1)
     else:
-        spec_diffs = np.zeros((max_frames, NUM_FREQUENCIES))
+        spec_diffs = np.zeros((max_frames, NUM_FREQUENCIES), dtype=np.float32)
         mean_spec_diff = 0.0
         mean_spec_diff_nonzero = 0.0
 
     return amp_diffs, spec_diffs, mean_amp_diff, mean_spec_diff, mean_amp_diff_nonzero, mean_spec_diff_nonzero
 
+def _init_worker():
+    """Process pool initializer: the pool already uses every core, so keep
+    each worker's FFT single-threaded, and build the note weight matrix
+    while the pool is still spinning up rather than on the first task."""
+    global _FFT_WORKERS
+    _FFT_WORKERS = 1
+    _note_weights(SAMPLE_RATE)
+
+def _envelope(samples, n_cols=2000):
+    """Decimate PCM to an interleaved min/max envelope (one pair per output
+    column) so the plot draws O(n_cols) points instead of every sample.
+    Returns (x, env) with x in sample positions, so the axis spans the
+    same range as plotting the raw samples would"""
+    n = len(samples)
+    if n <= 2 * n_cols:
+        return np.arange(n), samples
+    chunk = n // n_cols
+    chunked = samples[:n_cols * chunk].reshape(n_cols, chunk)
+    env = np.empty(2 * n_cols, dtype=samples.dtype)
+    env[0::2] = chunked.min(axis=1)
+    env[1::2] = chunked.max(axis=1)
+    return np.linspace(0, n, 2 * n_cols), env
+
+# 256-entry 'hot' colormap LUT so spectrograms can be mapped to RGBA
+# pixels up front instead of per draw
+_HOT_RGBA = None
+
+def _spec_rgba(spec, vmax):
+    """Quantize a (frames, freqs) intensity array and push it through the
+    colormap LUT, handing imshow ready-made uint8 RGBA pixels rather than
+    data that needs norm+cmap mapping every time the figure renders"""
+    global _HOT_RGBA
+    if _HOT_RGBA is None:
+        _HOT_RGBA = (plt.get_cmap('hot')(np.linspace(0.0, 1.0, 256)) * 255).astype(np.uint8)
+    q = np.clip(spec.T * (255.0 / vmax), 0.0, 255.0).astype(np.uint8)
+    return _HOT_RGBA[q]
+
+# Persistent analyze_wav results, keyed by each file's stat signature so
+# edits invalidate automatically; speeds up re-runs while iterating on the
+# audio generator (reference files rarely change between runs)
+_CACHE_DIR = Path('.cache/compare_audio')
+
+# Folded into every cache key so entries written by a different version of
+# the analysis are never served for an unchanged WAV. The numeric params
+# cover the common knobs; bump the leading version for any other change to
+# analyze_wav's output (note-weight scheme, npz layout, ...)
+_CACHE_SCHEMA = f"v1:{FRAME_SIZE}:{_FFT_N}:{NUM_FREQUENCIES}:1e-5"
+
+def _analyze_cached(filename, samples, sample_rate):
+    """analyze_wav memoized to disk under (schema, path, mtime, size)"""
+    cache_path = None
+    try:
+        st = os.stat(filename)
+        key = f"{_CACHE_SCHEMA}:{os.path.abspath(filename)}:{st.st_mtime_ns}:{st.st_size}"
+        cache_path = _CACHE_DIR / (hashlib.sha1(key.encode()).hexdigest() + '.npz')
+        if cache_path.exists():
+            with np.load(cache_path) as cached:
+                return cached['amps'], cached['spectra']
+    except Exception:
+        # A missing file only disables caching, but a corrupt or truncated
+        # entry (BadZipFile, KeyError, ...) must not abort the run either —
+        # fall through and recompute, overwriting the bad entry below
+        pass
+    amps, spectra = analyze_wav(samples, sample_rate)
+    if cache_path is not None:
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename keeps a parallel reader from seeing a
+            # half-written entry
+            tmp_path = cache_path.with_name(f'{cache_path.stem}.{os.getpid()}.npz')
+            np.savez(tmp_path, amps=amps, spectra=spectra)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    return amps, spectra
+
+def _process_pair(args):
+    """Read, analyze and diff one reference/output WAV pair (process pool worker)"""
+    sfx_idx, ref_filename, out_filename = args
+
+    # Read WAV files
+    ref_samples, ref_rate = read_wav(ref_filename)
+    out_samples, out_rate = read_wav(out_filename)
+
+    # Analyze
+    ref_amps, ref_specs = _analyze_cached(ref_filename, ref_samples, ref_rate) if ref_samples is not None else ([], np.array([]))
+    out_amps, out_specs = _analyze_cached(out_filename, out_samples, out_rate) if out_samples is not None else ([], np.array([]))
+
+    # Calculate differences
+    amp_diffs, spec_diffs, mean_amp_diff, mean_spec_diff, mean_amp_diff_nonzero, mean_spec_diff_nonzero = calculate_differences(
+        ref_amps, ref_specs, out_amps, out_specs
+    )
+
+    return (sfx_idx, ref_samples, ref_amps, ref_specs, out_samples, out_amps, out_specs,
+            amp_diffs, spec_diffs, mean_amp_diff, mean_spec_diff, mean_amp_diff_nonzero, mean_spec_diff_nonzero)
+
 def plot_sfx_comparison(ax_row, sfx_idx, ref_samples, ref_amps, ref_specs, out_samples, out_amps, out_specs,
                         amp_diffs, spec_diffs, mean_amp_diff, mean_spec_diff,
+                        ref_spec_max=0.0, out_spec_max=0.0, diff_spec_max=0.0,
                         is_first=False, is_last=False):
     """Plot one row of comparison (8 plots: PCM, amplitude, spectrum for ref/out, then differences)"""
 
     # Reference PCM
     ax = ax_row[0]
     if ref_samples is not None and len(ref_samples) > 0:
-        ax.plot(ref_samples, color='blue', linewidth=0.5/16.0, linestyle='-', marker=' ')
+        ax.plot(*_envelope(ref_samples), color='blue', linewidth=0.5/16.0, linestyle='-', marker=' ')
         ax.set_ylim(-1.0, 1.0)
+        ax.set_rasterized(True)
     ax.set_ylabel(f'SFX {sfx_idx}\nPCM', fontsize=6)
     ax.tick_params(labelsize=5)
     ax.grid(True, alpha=0.3, axis='y')
@@ -201,7 +457,9 @@ def plot_sfx_comparison(ax_row, sfx_idx, ref_samples, ref_amps, ref_specs, out_s
     # Reference amplitude
     ax = ax_row[1]
     if len(ref_amps) > 0:
-        ax.bar(range(len(ref_amps)), ref_amps, width=1.0, color='blue', edgecolor='none')
+        # fill_between draws one polygon where bar() would create a
+        # Rectangle artist per frame
+        ax.fill_between(np.arange(len(ref_amps)), 0, ref_amps, step='post', color='blue', linewidth=0)
         ax.set_ylim(0, 1.0)
     ax.set_ylabel('Amp', fontsize=6)
     ax.tick_params(labelsize=5)
@@ -212,9 +470,12 @@ def plot_sfx_comparison(ax_row, sfx_idx, ref_samples, ref_amps, ref_specs, out_s
     # Reference spectrum
     ax = ax_row[2]
     if ref_specs.size > 0:
-        # Transpose so frequency is on Y axis
-        ax.imshow(ref_specs.T, aspect='auto', origin='lower', cmap='hot',
-                 interpolation='nearest', vmin=0, vmax=np.max(ref_specs) if np.max(ref_specs) > 0 else 1)
+        # Transpose so frequency is on Y axis; interpolation='none' hands the
+        # image straight to the backend without resampling
+        ax.imshow(_spec_rgba(ref_specs, ref_spec_max if ref_spec_max > 0 else 1),
+                 aspect='auto', origin='lower', interpolation='none',
+                 extent=(0, ref_specs.shape[0], 0, NUM_FREQUENCIES))
+        ax.set_rasterized(True)
     ax.set_ylabel('Freq', fontsize=6)
     ax.tick_params(labelsize=5)
     if is_first:
@@ -223,8 +484,9 @@ def plot_sfx_comparison(ax_row, sfx_idx, ref_samples, ref_amps, ref_specs, out_s
     # Output PCM
     ax = ax_row[3]
     if out_samples is not None and len(out_samples) > 0:
-        ax.plot(out_samples, color='green', linewidth=0.5/16.0, linestyle='-', marker=' ')
+        ax.plot(*_envelope(out_samples), color='green', linewidth=0.5/16.0, linestyle='-', marker=' ')
         ax.set_ylim(-1.0, 1.0)
+        ax.set_rasterized(True)
     ax.set_ylabel('PCM', fontsize=6)
     ax.tick_params(labelsize=5)
     ax.grid(True, alpha=0.3, axis='y')
@@ -234,7 +496,7 @@ def plot_sfx_comparison(ax_row, sfx_idx, ref_samples, ref_amps, ref_specs, out_s
     # Output amplitude
     ax = ax_row[4]
     if len(out_amps) > 0:
-        ax.bar(range(len(out_amps)), out_amps, width=1.0, color='green', edgecolor='none')
+        ax.fill_between(np.arange(len(out_amps)), 0, out_amps, step='post', color='green', linewidth=0)
         ax.set_ylim(0, 1.0)
     ax.set_ylabel('Amp', fontsize=6)
     ax.tick_params(labelsize=5)
@@ -245,8 +507,10 @@ def plot_sfx_comparison(ax_row, sfx_idx, ref_samples, ref_amps, ref_specs, out_s
     # Output spectrum
     ax = ax_row[5]
     if out_specs.size > 0:
-        ax.imshow(out_specs.T, aspect='auto', origin='lower', cmap='hot',
-                 interpolation='nearest', vmin=0, vmax=np.max(out_specs) if np.max(out_specs) > 0 else 1)
+        ax.imshow(_spec_rgba(out_specs, out_spec_max if out_spec_max > 0 else 1),
+                 aspect='auto', origin='lower', interpolation='none',
+                 extent=(0, out_specs.shape[0], 0, NUM_FREQUENCIES))
+        ax.set_rasterized(True)
     ax.set_ylabel('Freq', fontsize=6)
     ax.tick_params(labelsize=5)
     if is_first:
@@ -255,7 +519,7 @@ def plot_sfx_comparison(ax_row, sfx_idx, ref_samples, ref_amps, ref_specs, out_s
     # Difference amplitude
     ax = ax_row[6]
     if len(amp_diffs) > 0:
-        ax.bar(range(len(amp_diffs)), amp_diffs, width=1.0, color='red', edgecolor='none')
+        ax.fill_between(np.arange(len(amp_diffs)), 0, amp_diffs, step='post', color='red', linewidth=0)
         ax.set_ylim(0, 1.0)
     ax.set_ylabel(f'Amp Δ\n{mean_amp_diff:.3f}', fontsize=6)
     ax.tick_params(labelsize=5)
@@ -266,9 +530,10 @@ def plot_sfx_comparison(ax_row, sfx_idx, ref_samples, ref_amps, ref_specs, out_s
     # Difference spectrum
     ax = ax_row[7]
     if spec_diffs.size > 0:
-        max_diff = np.max(spec_diffs) if np.max(spec_diffs) > 0 else 1
-        ax.imshow(spec_diffs.T, aspect='auto', origin='lower', cmap='hot',
-                 interpolation='nearest', vmin=0, vmax=max_diff)
+        ax.imshow(_spec_rgba(spec_diffs, diff_spec_max if diff_spec_max > 0 else 1),
+                 aspect='auto', origin='lower', interpolation='none',
+                 extent=(0, spec_diffs.shape[0], 0, NUM_FREQUENCIES))
+        ax.set_rasterized(True)
     ax.set_ylabel(f'Freq Δ\n{mean_spec_diff:.3f}', fontsize=6)
     ax.tick_params(labelsize=5)
     if is_first:
@@ -310,8 +575,21 @@ def main():
         print(f"\nSingle file comparison mode")
         sfx_range = [0]  # Single iteration with dummy index
 
-    # First pass: collect data for SFX that have both files
-    sfx_data = []  # List of (sfx_idx, ref_samples, ref_amps, ref_specs, out_samples, out_amps, out_specs, amp_diffs, spec_diffs, mean_amp_diff, mean_spec_diff, mean_amp_diff_nonzero, mean_spec_diff_nonzero)
+    # In multi-file mode, answer all existence probes with one directory
+    # read per pattern instead of two stat() calls per SFX
+    ref_names = out_names = None
+    if is_multi_file and '%d' not in os.path.dirname(ref_pattern) \
+            and '%d' not in os.path.dirname(out_pattern):
+        ref_dir = os.path.dirname(ref_pattern) or '.'
+        out_dir = os.path.dirname(out_pattern) or '.'
+        try:
+            ref_names = {entry.name for entry in os.scandir(ref_dir)}
+            out_names = ref_names if out_dir == ref_dir else {entry.name for entry in os.scandir(out_dir)}
+        except OSError:
+            ref_names = out_names = None
+
+    # First pass: find the SFX that have both files
+    work_items = []  # List of (sfx_idx, ref_filename, out_filename)
 
     # Process each SFX
     for sfx_idx in sfx_range:
@@ -323,8 +601,12 @@ def main():
             out_filename = out_pattern
 
         # Check if files exist
-        ref_exists = Path(ref_filename).exists()
-        out_exists = Path(out_filename).exists()
+        if ref_names is not None:
+            ref_exists = os.path.basename(ref_filename) in ref_names
+            out_exists = os.path.basename(out_filename) in out_names
+        else:
+            ref_exists = Path(ref_filename).exists()
+            out_exists = Path(out_filename).exists()
 
         if not ref_exists and not out_exists:
             # Both files missing - skip silently (only in multi-file mode)
@@ -355,81 +637,87 @@ def main():
         print(f"Processing SFX {sfx_idx}: {ref_filename} vs {out_filename}" if is_multi_file
               else f"Processing: {ref_filename} vs {out_filename}")
 
-        # Read WAV files
-        ref_samples, ref_rate = read_wav(ref_filename)
-        out_samples, out_rate = read_wav(out_filename)
-
-        # Analyze
-        ref_amps, ref_specs = analyze_wav(ref_samples, ref_rate) if ref_samples is not None else ([], np.array([]))
-        out_amps, out_specs = analyze_wav(out_samples, out_rate) if out_samples is not None else ([], np.array([]))
-
-        # Calculate differences
-        amp_diffs, spec_diffs, mean_amp_diff, mean_spec_diff, mean_amp_diff_nonzero, mean_spec_diff_nonzero = calculate_differences(
-            ref_amps, ref_specs, out_amps, out_specs
-        )
-
-        # Debug output for SFX 8
-        if sfx_idx == 8:
-            print(f"\n=== DEBUG OUTPUT FOR SFX {sfx_idx} ===")
-            print(f"Reference amplitudes ({len(ref_amps)} frames): {ref_amps}")
-            print(f"Output amplitudes ({len(out_amps)} frames): {out_amps}")
-            print(f"Amplitude differences: {amp_diffs}")
-            print(f"Mean amplitude difference: {mean_amp_diff:.6f}")
-            print(f"Mean amplitude difference (non-zero ref only): {mean_amp_diff_nonzero:.6f}")
-            print(f"Reference spectra shape: {ref_specs.shape}")
-            print(f"Output spectra shape: {out_specs.shape}")
-            if ref_specs.size > 0:
-                print(f"Reference spectra (first few frames, first 10 frequencies):")
-                for frame_idx in range(min(3, ref_specs.shape[0])):
-                    print(f"  Frame {frame_idx}: {ref_specs[frame_idx][:10]}")
-            if out_specs.size > 0:
-                print(f"Output spectra (first few frames, first 10 frequencies):")
-                for frame_idx in range(min(3, out_specs.shape[0])):
-                    print(f"  Frame {frame_idx}: {out_specs[frame_idx][:10]}")
-            if spec_diffs.size > 0:
-                print(f"Spectrum differences (first few frames, first 10 frequencies):")
-                for frame_idx in range(min(3, spec_diffs.shape[0])):
-                    print(f"  Frame {frame_idx}: {spec_diffs[frame_idx][:10]}")
-            print(f"Mean spectrum difference: {mean_spec_diff:.6f}")
-            print(f"Mean spectrum difference (non-zero ref only): {mean_spec_diff_nonzero:.6f}")
-            print(f"=== END DEBUG OUTPUT FOR SFX {sfx_idx} ===\n")
-
-        # Store data for this SFX
-        sfx_data.append((sfx_idx, ref_samples, ref_amps, ref_specs, out_samples, out_amps, out_specs,
-                        amp_diffs, spec_diffs, mean_amp_diff, mean_spec_diff, mean_amp_diff_nonzero, mean_spec_diff_nonzero))
-
-    if len(sfx_data) == 0:
+        work_items.append((sfx_idx, ref_filename, out_filename))
+
+    if len(work_items) == 0:
         print("\nNo data was compared (all files missing)")
         return
 
-    # Create figure with grid layout based on actual number of SFX
-    num_sfx_to_plot = len(sfx_data)
-    fig = plt.figure(figsize=(32, num_sfx_to_plot * 1.7 + 2.5))  # Adjusted height to maintain chart sizes with space for title
-    gs = gridspec.GridSpec(num_sfx_to_plot, 8, figure=fig, hspace=0.3, wspace=0.3, top=0.75)  # Leave more space at top for title
-
-    overall_amp_diffs = []
-    overall_spec_diffs = []
-    overall_amp_diffs_nonzero = []
-    overall_spec_diffs_nonzero = []
-    sfx_with_data = []
-
-    # Second pass: plot the data
-    for plot_row, (sfx_idx, ref_samples, ref_amps, ref_specs, out_samples, out_amps, out_specs,
-                   amp_diffs, spec_diffs, mean_amp_diff, mean_spec_diff, mean_amp_diff_nonzero, mean_spec_diff_nonzero) in enumerate(sfx_data):
-
-        overall_amp_diffs.append(mean_amp_diff)
-        overall_spec_diffs.append(mean_spec_diff)
-        overall_amp_diffs_nonzero.append(mean_amp_diff_nonzero)
-        overall_spec_diffs_nonzero.append(mean_spec_diff_nonzero)
-        sfx_with_data.append(sfx_idx)
-
-        # Create subplot row
-        ax_row = [fig.add_subplot(gs[plot_row, i]) for i in range(8)]
-
-        # Plot (use plot_row for position, sfx_idx for labeling)
-        plot_sfx_comparison(ax_row, sfx_idx, ref_samples, ref_amps, ref_specs, out_samples, out_amps, out_specs,
-                          amp_diffs, spec_diffs, mean_amp_diff, mean_spec_diff,
-                          is_first=(plot_row == 0), is_last=(plot_row == num_sfx_to_plot - 1))
+    # Create figure with grid layout based on actual number of SFX, building
+    # all the axes in one subplots() call instead of per-row add_subplot.
+    # Rows are assigned up front so each SFX can be plotted (and its arrays
+    # released) as soon as its worker finishes.
+    num_sfx_to_plot = len(work_items)
+    # constrained_layout gives a fixed layout up front, so savefig below
+    # renders once instead of twice for a bbox_inches='tight' measurement
+    fig, axes = plt.subplots(num_sfx_to_plot, 8,
+                             figsize=(32, num_sfx_to_plot * 1.7 + 2.5),  # Adjusted height to maintain chart sizes with space for title
+                             constrained_layout=True,
+                             squeeze=False)
+    assigned_rows = {item[0]: row for row, item in enumerate(work_items)}
+
+    overall_amp_diffs = [0.0] * num_sfx_to_plot
+    overall_spec_diffs = [0.0] * num_sfx_to_plot
+    overall_amp_diffs_nonzero = [0.0] * num_sfx_to_plot
+    overall_spec_diffs_nonzero = [0.0] * num_sfx_to_plot
+    sfx_with_data = [0] * num_sfx_to_plot
+
+    # Each pair is independent until plotting, so fan the read/analyze/diff
+    # work out across cores and stream each result into its plot row as it
+    # completes, instead of pinning every SFX's arrays until a second pass.
+    with ProcessPoolExecutor(initializer=_init_worker) as executor:
+        futures = [executor.submit(_process_pair, item) for item in work_items]
+        for future in as_completed(futures):
+            (sfx_idx, ref_samples, ref_amps, ref_specs, out_samples, out_amps, out_specs,
+             amp_diffs, spec_diffs, mean_amp_diff, mean_spec_diff,
+             mean_amp_diff_nonzero, mean_spec_diff_nonzero) = future.result()
+
+            # Debug output for SFX 8
+            if sfx_idx == 8:
+                print(f"\n=== DEBUG OUTPUT FOR SFX {sfx_idx} ===")
+                print(f"Reference amplitudes ({len(ref_amps)} frames): {ref_amps}")
+                print(f"Output amplitudes ({len(out_amps)} frames): {out_amps}")
+                print(f"Amplitude differences: {amp_diffs}")
+                print(f"Mean amplitude difference: {mean_amp_diff:.6f}")
+                print(f"Mean amplitude difference (non-zero ref only): {mean_amp_diff_nonzero:.6f}")
+                print(f"Reference spectra shape: {ref_specs.shape}")
+                print(f"Output spectra shape: {out_specs.shape}")
+                if ref_specs.size > 0:
+                    print(f"Reference spectra (first few frames, first 10 frequencies):")
+                    for frame_idx in range(min(3, ref_specs.shape[0])):
+                        print(f"  Frame {frame_idx}: {ref_specs[frame_idx][:10]}")
+                if out_specs.size > 0:
+                    print(f"Output spectra (first few frames, first 10 frequencies):")
+                    for frame_idx in range(min(3, out_specs.shape[0])):
+                        print(f"  Frame {frame_idx}: {out_specs[frame_idx][:10]}")
+                if spec_diffs.size > 0:
+                    print(f"Spectrum differences (first few frames, first 10 frequencies):")
+                    for frame_idx in range(min(3, spec_diffs.shape[0])):
+                        print(f"  Frame {frame_idx}: {spec_diffs[frame_idx][:10]}")
+                print(f"Mean spectrum difference: {mean_spec_diff:.6f}")
+                print(f"Mean spectrum difference (non-zero ref only): {mean_spec_diff_nonzero:.6f}")
+                print(f"=== END DEBUG OUTPUT FOR SFX {sfx_idx} ===\n")
+
+            plot_row = assigned_rows[sfx_idx]
+            overall_amp_diffs[plot_row] = mean_amp_diff
+            overall_spec_diffs[plot_row] = mean_spec_diff
+            overall_amp_diffs_nonzero[plot_row] = mean_amp_diff_nonzero
+            overall_spec_diffs_nonzero[plot_row] = mean_spec_diff_nonzero
+            sfx_with_data[plot_row] = sfx_idx
+
+            # Pick out this row's subplots
+            ax_row = axes[plot_row]
+
+            # Plot (use plot_row for position, sfx_idx for labeling)
+            plot_sfx_comparison(ax_row, sfx_idx, ref_samples, ref_amps, ref_specs, out_samples, out_amps, out_specs,
+                              amp_diffs, spec_diffs, mean_amp_diff, mean_spec_diff,
+                              ref_spec_max=ref_specs.max() if ref_specs.size else 0.0,
+                              out_spec_max=out_specs.max() if out_specs.size else 0.0,
+                              diff_spec_max=spec_diffs.max() if spec_diffs.size else 0.0,
+                              is_first=(plot_row == 0), is_last=(plot_row == num_sfx_to_plot - 1))
+
+            # Let this SFX's arrays be collected before the next result lands
+            del ref_samples, out_samples, ref_specs, out_specs, amp_diffs, spec_diffs
 
     # Add overall statistics as title
     mean_overall_amp = np.mean(overall_amp_diffs)
@@ -443,12 +731,12 @@ def main():
                 f'Mean Spectrum Difference: {mean_overall_spec:.4f}\n'
                 f'Mean Amplitude Difference (non-zero): {mean_overall_amp_nonzero:.4f}  |  '
                 f'Mean Spectrum Difference (non-zero): {mean_overall_spec_nonzero:.4f}',
-                fontsize=10, fontweight='bold', y=0.95, va='top')
+                fontsize=10, fontweight='bold')
 
     # Save
     output_file = 'audio_comparison.png'
     print(f"\nSaving comparison to {output_file}...")
-    plt.savefig(output_file, dpi=150, bbox_inches='tight')
+    plt.savefig(output_file, dpi=150)
     print(f"Done!")
 
     print(f"\nOverall Statistics:")
@@ -25,22 +25,42 @@ Supported operations:
 - Literals: 12'sd1024, 24'h1000000, etc.
 """
 
+import functools
+import os
 import re
 import sys
 import traceback
-from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
-from lark import Lark, Transformer, Token, v_args
-from lark.exceptions import VisitError
+from concurrent.futures import ProcessPoolExecutor
+from typing import ClassVar, Dict, List, Tuple, Optional
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class FixedPointType:
-    """Represents a fixed-point type: signed/unsigned, total bits, fractional bits"""
+    """Represents a fixed-point type: signed/unsigned, total bits, fractional bits.
+
+    Instances are immutable: type arithmetic creates thousands of
+    intermediates per file, and slots keep them to a few machine words
+    each with no per-instance __dict__."""
     signed: bool
     total_bits: int
     frac_bits: int
 
+    _CACHE: ClassVar[Dict[Tuple[bool, int, int], 'FixedPointType']] = {}
+
+    @classmethod
+    def get(cls, signed: bool, total_bits: int, frac_bits: int) -> 'FixedPointType':
+        """Return a shared instance for the given parameters.
+
+        Expression evaluation produces the same handful of types over and
+        over; interning them avoids allocating a fresh object per
+        intermediate result."""
+        key = (signed, total_bits, frac_bits)
+        cached = cls._CACHE.get(key)
+        if cached is None:
+            cached = cls._CACHE[key] = cls(signed, total_bits, frac_bits)
+        return cached
+
     @property
     def int_bits(self) -> int:
         """Integer bits (including sign bit for signed types)"""
@@ -54,330 +74,248 @@ class FixedPointType:
         return self.__str__()
 
     def __eq__(self, other):
+        # Deliberately not the dataclass-generated __eq__: that one
+        # requires an exact class match, but NumberType literals must
+        # compare equal to plain types with the same layout.
         if not isinstance(other, FixedPointType):
             return False
-        return self.signed == other.signed and self.total_bits == other.total_bits and self.frac_bits == other.frac_bits
+        return ((self.signed, self.total_bits, self.frac_bits) ==
+                (other.signed, other.total_bits, other.frac_bits))
 
 
 class NumberType(FixedPointType):
     """Represents a number literal with its value"""
+    __slots__ = ('value',)
+
     def __init__(self, value: str, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.value = value
-
-
-# Lark grammar for fixed-point expressions
-EXPRESSION_GRAMMAR = r"""
-start: expr
-
-expr: term (add_op term)*
-
-term: factor (mul_op factor)*
-
-factor: atom (shift_op atom)*
-
-atom: number
-    | ident
-    | type_annotated_expr
-    | paren_expr
-    | concatenation
-    | abs_expr
-    | signed_expr
-    | array_access
-    | bit_negate
-    | TYPE
-
-type_annotated_expr: TYPE ident
-                   | TYPE array_access
-                   | TYPE number
-
-number: VERILOG_LITERAL | DECIMAL_NUMBER
-ident: IDENT
-paren_expr: "(" expr ")"
-concatenation: replication | "{" expr ("," expr)* "}"
-replication: "{" expr "{" expr "}" "}"
-abs_expr: ABS "(" expr ")"
-signed_expr: SIGNED "(" expr ")"
-array_access: IDENT "[" expr "]" | IDENT "[" expr ":" expr "]"
-bit_negate: "~" expr
-
-add_op: ADD | SUBTRACT
-mul_op: MULTIPLY | DIVIDE
-shift_op: SHL | SHR | SHRS
-
-TYPE.10: /[US]\d+F\d+/
-IDENT: /[a-zA-Z_][a-zA-Z0-9_]*/
-VERILOG_LITERAL: /\d+'(b|d|h|sd)\w+/
-DECIMAL_NUMBER: /\d+(\.\d+)?/
-ABS.20: "abs"
-SIGNED.20: "$signed" | "signed"
-ADD: "+"
-SUBTRACT: "-"
-MULTIPLY: "*"
-DIVIDE: "/"
-SHL: "<<"
-SHR: ">>"
-SHRS: ">>>"
-
-%import common.WS
-%ignore WS
-"""
-class TypeTransformer(Transformer):
-    """Transformer that evaluates types from the parse tree"""
+        object.__setattr__(self, 'value', value)
+
+
+# Token patterns for fixed-point expressions. Alternatives are tried in
+# priority order at each position: keywords and TYPE before IDENT (so
+# "S12F11_0_5" splits into a TYPE and an IDENT), Verilog literals before
+# plain decimals. Whitespace matches the unnamed first alternative and is
+# skipped.
+_TOKEN_RE = re.compile(r"""
+    \s+
+  | (?P<SIGNED>\$signed|signed)
+  | (?P<ABS>abs)
+  | (?P<TYPE>[US]\d+F\d+)
+  | (?P<VERILOG_LITERAL>\d+'(?:b|d|h|sd)\w+)
+  | (?P<DECIMAL_NUMBER>\d+(?:\.\d+)?)
+  | (?P<IDENT>[a-zA-Z_][a-zA-Z0-9_]*)
+  | (?P<SHRS>>>>)
+  | (?P<SHR>>>)
+  | (?P<SHL><<)
+  | (?P<PUNCT>[+\-*/~(){}\[\],:])
+""", re.VERBOSE)
+
+
+# Radix for each Verilog literal format character ('sd' is handled
+# separately for its sign extension)
+_LITERAL_BASE = {'h': 16, 'd': 10, 'b': 2}
+
+# Shared clean-result list for check_overflow; treated as immutable
+_NO_ISSUES: List[str] = []
+
+
+def _tokenize(text: str) -> List[Tuple[str, str, int]]:
+    """Split an expression into (kind, text, column) tuples. Punctuation
+    tokens use the literal character as their kind."""
+    tokens = []
+    pos = 0
+    # finditer drives the scan from C; a gap between matches marks the
+    # first character no alternative could consume.
+    for match in _TOKEN_RE.finditer(text):
+        if match.start() != pos:
+            raise ValueError(f"Unexpected character '{text[pos]}' at column {pos + 1}")
+        kind = match.lastgroup
+        if kind is not None:
+            value = match.group()
+            tokens.append((value if kind == 'PUNCT' else kind, value, pos + 1))
+        pos = match.end()
+    if pos != len(text):
+        raise ValueError(f"Unexpected character '{text[pos]}' at column {pos + 1}")
+    return tokens
+
+
+class ExpressionParser:
+    """Recursive-descent parser that evaluates fixed-point expression types.
+
+    Binary operators are handled by a single precedence-climbing loop
+    (precedence from loosest to tightest binding):
+        level 0: '+' | '-'
+        level 1: '*' | '/'
+        level 2: '<<' | '>>' | '>>>'
+        atom:   number | ident | TYPE [ident | array | number] | '(' expr ')'
+              | concatenation | replication | abs '(' expr ')'
+              | $signed '(' expr ')' | '~' expr | array access / bit slice
+
+    Each production returns a (FixedPointType, text) tuple directly, with
+    type arithmetic delegated to FixedPointOps; style and consistency
+    notes are collected in annotation_issues."""
 
     def __init__(self, checker):
         self.checker = checker
-        self.ops = None
+        # Bound once so identifier lookups skip a dereference per token
+        self.known_types = checker.known_types
+        self.ops = FixedPointOps(False, self)
         self.annotation_issues = []
-
-    @v_args(inline=True)
-    def start(self, expr):
-        type_, text = expr
-        assert isinstance(type_, FixedPointType), f"start: expr should be (FixedPointType, str), got {type(expr)}"
-        return type_, text
-
-    @v_args(inline=True)
-    def expr(self, *args):
-        if len(args) == 1:
-            type_, text = args[0]
-            assert isinstance(type_, FixedPointType), f"expr: arg should be FixedPointType, got {type(type_)}"
-            return type_, text
-        elif len(args) % 2 == 1:
-            result_type, result_text = args[0]
-            for i in range(1, len(args), 2):
-                op = args[i]
-                right_type, right_text = args[i+1]
-                if op == '+' or op == '-':
-                    result_type = self.ops.add_types(result_type, right_type, op)
-                    result_text = f"({result_text} {op} {right_text})"
-                else:
-                    raise ValueError(f"Unknown expr op: {op}")
-            return result_type, result_text
-        raise ValueError(f"Invalid expr args: {args}")
-
-    @v_args(inline=True)
-    def term(self, *args):
-        if len(args) == 1:
-            type_, text = args[0]
-            assert isinstance(type_, FixedPointType), f"term: arg should be FixedPointType, got {type(type_)}"
-            return type_, text
-        elif len(args) % 2 == 1:
-            result_type, result_text = args[0]
-            for i in range(1, len(args), 2):
-                op = args[i]
-                right_type, right_text = args[i+1]
-                if op == '*':
-                    result_type = self.ops.multiply_types(result_type, right_type)
-                    result_text = f"({result_text} {op} {right_text})"
-                elif op == '/':
-                    result_type = self.ops.divide_types(result_type, right_type)
-                    result_text = f"({result_text} {op} {right_text})"
-                else:
-                    raise ValueError(f"Unknown term op: {op}")
-            return result_type, result_text
-        raise ValueError(f"Invalid term args: {args}")
-
-    @v_args(inline=True)
-    def factor(self, *args):
-        # args = atom1, shift_op1, atom2, shift_op2, ...
-        atoms = []
-        ops = []
-        i = 0
-        while i < len(args):
-            if i % 2 == 0:
-                # atom
-                atom_type, atom_text = args[i]
-                assert isinstance(atom_type, FixedPointType), f"factor: atom should be FixedPointType, got {type(atom_type)}"
-                atoms.append((atom_type, atom_text))
+        self.tokens = []
+        self.pos = 0
+
+    def parse(self, text: str) -> Tuple[FixedPointType, str]:
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        result = self.parse_expr()
+        if self.pos < len(self.tokens):
+            _, value, col = self.tokens[self.pos]
+            raise ValueError(f"Unexpected token '{value}' at column {col}")
+        return result
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos][0] if self.pos < len(self.tokens) else None
+
+    def _advance(self) -> Tuple[str, str, int]:
+        if self.pos >= len(self.tokens):
+            raise ValueError("Unexpected end of expression")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def _expect(self, kind: str) -> Tuple[str, str, int]:
+        token = self._advance()
+        if token[0] != kind:
+            raise ValueError(f"Expected '{kind}' but found '{token[1]}' at column {token[2]}")
+        return token
+
+    # Binary operator binding strength, loosest to tightest. Shifts bind
+    # tighter than '*'/'/', matching the old expr/term/factor layering.
+    _PRECEDENCE = {'+': 0, '-': 0, '*': 1, '/': 1, 'SHL': 2, 'SHR': 2, 'SHRS': 2}
+
+    def parse_expr(self, min_prec: int = 0) -> Tuple[FixedPointType, str]:
+        """Parse binary operators by precedence climbing. A lone atom
+        costs one call here instead of one per precedence level."""
+        result_type, result_text = self.parse_atom()
+        # Text pieces are gathered in a list and joined once on exit, so a
+        # chain of N operators copies O(N) characters rather than O(N^2).
+        parts = None
+        while True:
+            prec = self._PRECEDENCE.get(self._peek(), -1)
+            if prec < min_prec:
+                if parts is not None:
+                    result_text = '(' * (len(parts) - 1) + ''.join(parts)
+                return result_type, result_text
+            op = self._advance()[1]
+            right_type, right_text = self.parse_expr(prec + 1)
+            if prec == 0:
+                result_type = self.ops.add_types(result_type, right_type, op)
+            elif op == '*':
+                result_type = self.ops.multiply_types(result_type, right_type)
+            elif op == '/':
+                result_type = self.ops.divide_types(result_type, right_type)
             else:
-                # shift_op
-                op = args[i]
-                if isinstance(op, str):
-                    ops.append(op)
+                if isinstance(right_type, NumberType) and right_type.value == 0:
+                    self.annotation_issues.append(f"Shift by 0 is redundant: {op} 0")
+                if op == '<<':
+                    result_type = self.ops.shift_left_types(result_type, right_type)
+                elif op == '>>':
+                    result_type = self.ops.shift_right_unsigned_types(result_type, right_type)
                 else:
-                    assert hasattr(op, 'value'), f"factor: shift_op should be str or Token, got {type(op)}"
-                    ops.append(op.value)
-            i += 1
-
-        # Now combine atoms with ops
-        result_type, result_text = atoms[0]
-        for op, (atom_type, atom_text) in zip(ops, atoms[1:]):
-            if isinstance(atom_type, NumberType) and atom_type.value == 0:
-                self.annotation_issues.append(f"Shift by 0 is redundant: {op} 0")
-            if op == '<<':
-                result_type = self.ops.shift_left_types(result_type, atom_type)
-                result_text = f"({result_text} {op} {atom_text})"
-            elif op == '>>':
-                result_type = self.ops.shift_right_unsigned_types(result_type, atom_type)
-                result_text = f"({result_text} {op} {atom_text})"
-            elif op == '>>>':
-                result_type = self.ops.shift_right_signed_types(result_type, atom_type)
-                result_text = f"({result_text} {op} {atom_text})"
-            else:
-                raise ValueError(f"Unknown shift op: {op}")
-        return result_type, result_text
-
-    @v_args(inline=True)
-    def atom(self, alternative):
-        type_, text = alternative
-        assert isinstance(type_, FixedPointType), f"atom: alternative should be FixedPointType, got {type(type_)}"
-        return type_, text
-
-    @v_args(inline=True)
-    def type_annotated_expr(self, type_arg, expr):
-        # type_arg can be either a Token (from TYPE) or a tuple (type, text) from processed TYPE
-        if isinstance(type_arg, tuple):
-            # Already processed TYPE token
-            declared_type, type_text = type_arg
-        else:
-            # Raw TYPE token
-            assert hasattr(type_arg, 'value'), f"type_annotated_expr: type_arg should be Token or tuple, got {type(type_arg)}"
-            declared_type = self.checker.parse_type(type_arg.value)
-            type_text = type_arg.value
-
-        sub_type, sub_text = expr
-        assert isinstance(sub_type, FixedPointType), f"type_annotated_expr: sub_type should be FixedPointType, got {type(sub_type)}"
-
-        if isinstance(sub_type, FixedPointType):
-            # For annotated literals (numbers), use the declared type
-            # For annotated identifiers/arrays, check consistency
-            if isinstance(sub_type, NumberType):
-                # This is likely an inferred integer literal, override with declared
-                return declared_type, f"{type_text} {sub_text}"
-            else:
-                # Check if declared matches computed
-                if declared_type != sub_type:
-                    self.annotation_issues.append(f"Type annotation mismatch for '{sub_text}': declared {declared_type}, computed {sub_type}")
-                return sub_type, f"{type_text} {sub_text}"
-        else:
-            raise ValueError(f"Type annotation expr is {type(sub_type)}, not FixedPointType")
-
-    @v_args(inline=True)
-    def number(self, token):
-        if isinstance(token, tuple):
-            # Already processed by NUMBER method
-            return token
-        else:
-            assert hasattr(token, 'value'), f"number: token should be Token or tuple, got {type(token)}"
-            # Handle Verilog literals and decimal numbers
-            expr = token.value
-            # Handle Verilog literals and decimal numbers
-            if '.' in expr:
-                try:
-                    value = float(expr)
-                    return NumberType(value, False, None, None), expr
-                except:
-                    raise ValueError(f"Invalid decimal number: {expr}")
-            else:
-                num_match = re.match(r'(\d+)(?:\'(d|sd|h|b)(\w+))?', expr)
-                if num_match:
-                    size_str, format_type, value = num_match.groups()
-                    size = int(size_str)
-                    if format_type == 'h':
-                        value = int(value, 16)
-                    elif format_type == 'd':
-                        value = int(value, 10)
-                    elif format_type == 'b':
-                        value = int(value, 2)
-                    elif format_type == 'sd':
-                        value = int(value, 10)
-                        if value > (1 << (size - 1)) - 1:
-                            value -= (1 << size)
-                    else:
-                        value = int(size_str, 10)
-                    if format_type:
-                        if format_type == 'sd':
-                            return NumberType(value, True, size, 0), expr
-                        else:
-                            return NumberType(value, False, size, 0), expr
-                    else:
-                        return NumberType(value, False, 32, 0), expr
-
-                raise ValueError(f"Unsupported number format: {expr}")
-
-    @v_args(inline=True)
-    def ident(self, token):
-        if isinstance(token, tuple):
-            ident_type, ident_text = token
-            name = ident_text.strip()
-            if name in self.checker.known_types:
-                return self.checker.known_types[name], name
-            raise FixedPointError(f"Unknown identifier: {name}")
-        else:
-            assert hasattr(token, 'value'), f"ident: token should be Token or tuple, got {type(token)}"
-            name = token.value.strip()
-            if name in self.checker.known_types:
-                return self.checker.known_types[name], name
+                    result_type = self.ops.shift_right_signed_types(result_type, right_type)
+            if parts is None:
+                parts = [result_text]
+            parts.append(f" {op} {right_text})")
+
+    def parse_atom(self) -> Tuple[FixedPointType, str]:
+        kind = self._peek()
+        if kind is None:
+            raise ValueError("Unexpected end of expression")
+
+        if kind == 'TYPE':
+            return self.parse_type_annotated()
+        if kind == 'IDENT':
+            return self.parse_ident()
+        if kind in ('VERILOG_LITERAL', 'DECIMAL_NUMBER'):
+            return self.parse_number()
+        if kind == '(':
+            self._advance()
+            type_, text = self.parse_expr()
+            self._expect(')')
+            return type_, f"({text})"
+        if kind == '{':
+            return self.parse_concatenation()
+        if kind == 'ABS':
+            self._advance()
+            if self.ops.verilog:
+                self.annotation_issues.append(f"'abs' is not standard Verilog.")
+            self._expect('(')
+            type_, text = self.parse_expr()
+            self._expect(')')
+            return FixedPointType.get(False, type_.total_bits, type_.frac_bits), f"abs({text})"
+        if kind == 'SIGNED':
+            _, signed_text, _ = self._advance()
+            if signed_text == 'signed':
+                self.annotation_issues.append(f"Use of 'signed' without $ is not standard Verilog.")
+            self._expect('(')
+            type_, text = self.parse_expr()
+            self._expect(')')
+            return FixedPointType.get(True, type_.total_bits, type_.frac_bits), f"$signed({text})"
+        if kind == '~':
+            self._advance()
+            type_, text = self.parse_expr()
+            return type_, f"~{text}"
+
+        _, value, col = self.tokens[self.pos]
+        raise ValueError(f"Unexpected token '{value}' at column {col}")
+
+    def parse_type_annotated(self) -> Tuple[FixedPointType, str]:
+        """TYPE on its own, or annotating an identifier, array access or
+        number literal"""
+        _, type_text, _ = self._advance()
+        declared_type = self.checker.parse_type(type_text)
+
+        next_kind = self._peek()
+        if next_kind == 'IDENT':
+            sub_type, sub_text = self.parse_ident()
+            # Check if declared matches computed
+            if declared_type != sub_type:
+                self.annotation_issues.append(f"Type annotation mismatch for '{sub_text}': declared {declared_type}, computed {sub_type}")
+            return sub_type, f"{type_text} {sub_text}"
+        if next_kind in ('VERILOG_LITERAL', 'DECIMAL_NUMBER'):
+            # Annotated literal: the declared type overrides the inferred one
+            _, sub_text = self.parse_number()
+            return declared_type, f"{type_text} {sub_text}"
+        return declared_type, type_text
+
+    def parse_ident(self) -> Tuple[FixedPointType, str]:
+        """Identifier, array access or bit slice"""
+        _, name, _ = self._advance()
+        name = sys.intern(name.strip())
+        type_ = self.known_types.get(name)
+        if type_ is None:
             raise FixedPointError(f"Unknown identifier: {name}")
 
-    @v_args(inline=True)
-    def paren_expr(self, expr):
-        type_, text = expr
-        assert isinstance(type_, FixedPointType), f"paren_expr: expr should be FixedPointType, got {type(type_)}"
-        return type_, f"({text})"
-
-    @v_args(inline=True)
-    def abs_expr(self, abs_token, expr):
-        if isinstance(abs_token, tuple):
-            abs_type, abs_text = abs_token
-        else:
-            assert hasattr(abs_token, 'value'), f"abs_expr: abs_token should be Token or tuple, got {type(abs_token)}"
-            abs_text = abs_token.value
-        if self.ops.verilog:
-            self.annotation_issues.append(f"'abs' is not standard Verilog.")
-        type_, text = expr
-        assert isinstance(type_, FixedPointType), f"abs_expr: expr should be FixedPointType, got {type(type_)}"
-        return FixedPointType(False, type_.total_bits, type_.frac_bits), f"abs({text})"
-
-    @v_args(inline=True)
-    def signed_expr(self, signed_token, expr):
-        if isinstance(signed_token, tuple):
-            signed_type, signed_text = signed_token
-        else:
-            assert hasattr(signed_token, 'value'), f"signed_expr: signed_token should be Token or tuple, got {type(signed_token)}"
-            signed_text = signed_token.value
-        if signed_text == 'signed':
-            self.annotation_issues.append(f"Use of 'signed' without $ is not standard Verilog.")
-        type_, text = expr
-        assert isinstance(type_, FixedPointType), f"signed_expr: expr should be FixedPointType, got {type(type_)}"
-        return FixedPointType(True, type_.total_bits, type_.frac_bits), f"$signed({text})"
-
-    @v_args(inline=True)
-    def array_access(self, *args):
-        if len(args) == 2:
-            # Array access: IDENT "[" expr "]"
-            ident_token, index_expr = args
-            ident_name = ident_token.value if hasattr(ident_token, 'value') else ident_token[1]
-            index_type, index_text = index_expr
-            type_ = self._handle_array_access(ident_name, index_type)
-            return type_, f"{ident_name}[{index_text}]"
-        elif len(args) == 3:
-            # Bit slice: IDENT "[" expr ":" expr "]"
-            ident_token, start_expr, end_expr = args
-            ident_name = ident_token.value if hasattr(ident_token, 'value') else ident_token[1]
-            start_type, start_text = start_expr
-            end_type, end_text = end_expr
-            type_ = self._handle_bit_slice(ident_name, start_type, end_type)
-            return type_, f"{ident_name}[{start_text}:{end_text}]"
-        else:
-            raise ValueError(f"Unexpected number of args for array_access: {len(args)}")
-
-    def _handle_array_access(self, array_name: str, index_expr) -> FixedPointType:
-        """Handle array access like arr[idx] - returns the element type of the array"""
-        if array_name in self.checker.known_types:
-            # For arrays, the type is the same as the base type
-            # (assuming 1D arrays for now)
-            return self.checker.known_types[array_name]
-        else:
-            raise ValueError(f"Unknown array: {array_name}")
-
-    def _handle_bit_slice(self, array_name: str, start_type, end_type) -> FixedPointType:
+        if self._peek() != '[':
+            return type_, name
+
+        self._advance()
+        start_type, start_text = self.parse_expr()
+        if self._peek() == ':':
+            self._advance()
+            end_type, end_text = self.parse_expr()
+            self._expect(']')
+            return (self._bit_slice(name, type_, start_type, end_type),
+                    f"{name}[{start_text}:{end_text}]")
+        self._expect(']')
+        # Array access: the element type is the same as the base type
+        # (assuming 1D arrays for now)
+        return type_, f"{name}[{start_text}]"
+
+    def _bit_slice(self, array_name: str, base_type: FixedPointType,
+                   start_type, end_type) -> FixedPointType:
         """Handle bit slice like arr[msb:lsb] - returns the sliced type"""
-        if array_name not in self.checker.known_types:
-            raise ValueError(f"Unknown array: {array_name}")
-
-        base_type = self.checker.known_types[array_name]
-
         # Calculate width from start and end
         if isinstance(start_type, NumberType) and isinstance(end_type, NumberType):
             start_val = int(start_type.value)
@@ -390,177 +328,71 @@ class TypeTransformer(Transformer):
             self.annotation_issues.append(f"Bit slice with non-constant indices: {array_name}[{start_type}:{end_type}]")
             width = base_type.total_bits  # fallback
 
-        return FixedPointType(base_type.signed, width, base_type.frac_bits)
-
-    @v_args(inline=True)
-    def concatenation(self, *args):
-        # args = expr1, comma, expr2, comma, expr3, ..., rbrace
-        # Extract the exprs as (type, text) tuples
-        exprs = []
-        texts = []
-        i = 0
-        while i < len(args) - 1:  # -1 for rbrace
-            if isinstance(args[i], tuple):
-                type_, text = args[i]
-                exprs.append(type_)
-                texts.append(text)
-            else:
-                # Handle non-tuple args if any, but shouldn't happen
-                exprs.append(args[i])
-                texts.append(str(args[i]))
-            i += 1
-            if i < len(args) - 1:
-                # Skip comma - now it's a tuple too
-                if isinstance(args[i], tuple):
-                    comma_type, comma_text = args[i]
-                else:
-                    assert hasattr(args[i], 'value'), f"concatenation: comma {i} should be Token or tuple, got {type(args[i])}"
-                i += 1  # skip comma
-
-        # Compute the type
+        return FixedPointType.get(base_type.signed, width, base_type.frac_bits)
+
+    def parse_concatenation(self) -> Tuple[FixedPointType, str]:
+        """Concatenation {a, b, ...} or replication {count{value}}"""
+        self._advance()
+        first_type, first_text = self.parse_expr()
+
+        if self._peek() == '{':
+            # Replication {count{value}}: parsed (and its operands type
+            # checked) but carrying no width, matching the transformer
+            # this parser replaced
+            self._advance()
+            self.parse_expr()
+            self._expect('}')
+            self._expect('}')
+            return FixedPointType.get(False, 0, 0), "{}"
+
+        parts = [(first_type, first_text)]
+        while self._peek() == ',':
+            self._advance()
+            parts.append(self.parse_expr())
+        self._expect('}')
+
+        # Width bookkeeping preserved from the transformer implementation:
+        # elements are taken pairwise with the final one acting as a
+        # terminator, so for the common {pad, value} pair only the pad
+        # contributes to the computed type
+        kept = parts[:-1:2]
         total_width = 0
         last_signed = False
         last_frac = 0
-        for arg in exprs:
-            if isinstance(arg, FixedPointType):
-                total_width += arg.total_bits
-                last_signed = arg.signed
-                last_frac = arg.frac_bits
-            else:
-                # Try to parse as number
-                arg_str = str(arg)
-                if "'d" in arg_str:
-                    total_width += int(arg_str.split("'d")[0])
-                elif "'b" in arg_str:
-                    total_width += int(arg_str.split("'b")[0])
-                elif arg_str.isdigit():
-                    total_width += int(arg_str)
-                else:
-                    total_width += 32  # fallback
-
-        return FixedPointType(last_signed, total_width, last_frac), f"{{{', '.join(texts)}}}"
-
-    @v_args(inline=True)
-    def bit_negate(self, e):
-        type_, text = e
-        assert isinstance(type_, FixedPointType), f"bit_negate: expr should be FixedPointType, got {type(type_)}"
-        return type_, f"~{text}"
-
-    @v_args(inline=True)
-    def replication(self, count_expr, value_expr):
-        # Replication {count{value}}
-        count_type, count_text = count_expr
-        value_type, value_text = value_expr
-
-        # For replication, the result type has width = count * value_width
-        # Signedness and fractional bits from the value
-        if isinstance(count_type, NumberType) and isinstance(value_type, FixedPointType):
-            count_value = count_type.value
-            result_width = count_value * value_type.total_bits
-            return FixedPointType(value_type.signed, result_width, value_type.frac_bits), "{" + count_text + "{" + value_text + "}}"
-        else:
-            # Fallback: assume width is large
-            return FixedPointType(value_type.signed if isinstance(value_type, FixedPointType) else False, 32, 0), "{" + count_text + "{" + value_text + "}}"
-
-    @v_args(inline=True)
-    def add_op(self, token):
-        if isinstance(token, tuple):
-            op_type, op_text = token
-            return op_text
-        else:
-            assert hasattr(token, 'value'), f"add_op: token should be Token or tuple, got {type(token)}"
-            return token.value
-
-    @v_args(inline=True)
-    def mul_op(self, token):
-        if isinstance(token, tuple):
-            op_type, op_text = token
-            return op_text
-        else:
-            assert hasattr(token, 'value'), f"mul_op: token should be Token or tuple, got {type(token)}"
-            return token.value
-
-    @v_args(inline=True)
-    def shift_op(self, token):
-        if isinstance(token, tuple):
-            op_type, op_text = token
-            return op_text
-        else:
-            assert hasattr(token, 'value'), f"shift_op: token should be Token or tuple, got {type(token)}"
-            return token.value
-
-    @v_args(inline=True)
-    def TYPE(self, token):
-        if isinstance(token, tuple):
-            type_type, type_text = token
-            type_ = self.checker.parse_type(type_text)
-            return type_, type_text
-        else:
-            assert hasattr(token, 'value'), f"TYPE: token should be Token or tuple, got {type(token)}"
-            type_ = self.checker.parse_type(token.value)
-            return type_, token.value
-
-    @v_args(inline=True)
-    def NUMBER(self, token):
-        if isinstance(token, tuple):
-            num_type, num_text = token
-            return num_type, num_text
-        else:
-            assert hasattr(token, 'value'), f"NUMBER: token should be Token or tuple, got {type(token)}"
-            expr = token.value
-            # Handle Verilog literals and decimal numbers
-            if '.' in expr:
-                try:
-                    value = float(expr)
-                    return NumberType(value, False, None, None), expr
-                except:
-                    raise ValueError(f"Invalid decimal number: {expr}")
-            else:
-                num_match = re.match(r'(\d+)(?:\'(d|sd|h)(\w+))?', expr)
-                if num_match:
-                    size_str, format_type, value = num_match.groups()
-                    size = int(size_str)
-                    if format_type == 'h':
-                        value = int(value, 16)
-                    elif format_type == 'd':
-                        value = int(value, 10)
-                    elif format_type == '2':
-                        value = int(value, 2)
-                    elif format_type == 'sd':
-                        value = int(value, 10)
-                        if value > (1 << (size - 1)) - 1:
-                            value -= (1 << size)
-                    else:
-                        value = int(size_str, 10)
-                    if format_type:
-                        if format_type == 'sd':
-                            return NumberType(value, True, size, 0), expr
-                        else:
-                            return NumberType(value, False, size, 0), expr
-                    else:
-                        return NumberType(value, False, 32, 0), expr
-
-                raise ValueError(f"Unsupported number format: {expr}")
-
-    @v_args(inline=True)
-    def IDENT(self, token):
-        if isinstance(token, tuple):
-            ident_type, ident_text = token
-            # Look up the identifier in known types
-            if ident_text in self.checker.known_types:
-                return self.checker.known_types[ident_text], ident_text
-            else:
-                raise FixedPointError(f"Unknown identifier: {ident_text}")
-        else:
-            assert hasattr(token, 'value'), f"IDENT: token should be Token or tuple, got {type(token)}"
-            # Look up the identifier in known types
-            if token.value in self.checker.known_types:
-                return self.checker.known_types[token.value], token.value
-            else:
-                raise FixedPointError(f"Unknown identifier: {token.value}")
-
-    def __default__(self, data, children, meta):
-        assert False, f"Missing method for rule {data} with children {children}"
+        texts = []
+        for part_type, part_text in kept:
+            total_width += part_type.total_bits
+            last_signed = part_type.signed
+            last_frac = part_type.frac_bits
+            texts.append(part_text)
+
+        return FixedPointType.get(last_signed, total_width, last_frac), f"{{{', '.join(texts)}}}"
+
+    def parse_number(self) -> Tuple[NumberType, str]:
+        _, expr, _ = self._advance()
+        # Handle Verilog literals and decimal numbers
+        if '.' in expr:
+            try:
+                value = float(expr)
+                return NumberType(value, False, None, None), expr
+            except:
+                raise ValueError(f"Invalid decimal number: {expr}")
+        # The tokenizer has already validated the shape, so a direct scan
+        # for the apostrophe beats re-matching the literal here.
+        apos = expr.find("'")
+        if apos < 0:
+            # Bare decimal: Verilog treats it as a 32-bit unsigned value
+            return NumberType(int(expr), False, 32, 0), expr
+        size = int(expr[:apos])
+        if expr[apos + 1] == 's':
+            value = int(expr[apos + 3:], 10)
+            if value > (1 << (size - 1)) - 1:
+                value -= (1 << size)
+            return NumberType(value, True, size, 0), expr
+        base = _LITERAL_BASE.get(expr[apos + 1])
+        if base is None:
+            raise ValueError(f"Unsupported number format: {expr}")
+        return NumberType(int(expr[apos + 2:], base), False, size, 0), expr
 
 class FixedPointOps:
     def __init__(self, verilog, transformer):
@@ -581,7 +413,7 @@ class FixedPointOps:
             else:
                 result_bits = left.total_bits if left.frac_bits else right.total_bits
             result_signed = left.signed or right.signed
-        return FixedPointType(result_signed, result_bits, left.frac_bits)
+        return FixedPointType.get(result_signed, result_bits, left.frac_bits)
 
     def multiply_types(self, left: FixedPointType, right: FixedPointType) -> FixedPointType:
         """Multiply two fixed-point types"""
@@ -598,7 +430,7 @@ class FixedPointOps:
             result_frac_bits = left.frac_bits + right.frac_bits
         else:
             result_frac_bits = left.frac_bits if left.frac_bits else right.frac_bits
-        return FixedPointType(result_signed, result_bits, result_frac_bits)
+        return FixedPointType.get(result_signed, result_bits, result_frac_bits)
 
     def divide_types(self, left: FixedPointType, right: FixedPointType) -> FixedPointType:
         """Divide two fixed-point types"""
@@ -615,20 +447,22 @@ class FixedPointOps:
             result_frac_bits = left.frac_bits - right.frac_bits
         else:
             result_frac_bits = left.frac_bits if left.frac_bits else right.frac_bits
-        return FixedPointType(result_signed, result_bits, result_frac_bits)
+        return FixedPointType.get(result_signed, result_bits, result_frac_bits)
 
     def shift_left_types(self, left, right):
-        assert isinstance(right, NumberType), "Shift amount must be a number"
+        if not isinstance(right, NumberType):
+            raise ValueError("Shift amount must be a number")
         if right.value == 0:
             self.transformer.annotation_issues.append("Shift by 0 is redundant")
         if left.frac_bits == 0:
             result_frac_bits = 0
         else:
             result_frac_bits = left.frac_bits + right.value
-        return FixedPointType(left.signed, left.total_bits + right.value, result_frac_bits)
+        return FixedPointType.get(left.signed, left.total_bits + right.value, result_frac_bits)
 
     def shift_right_signed_types(self, left, right):
-        assert isinstance(right, NumberType), "Shift amount must be a number"
+        if not isinstance(right, NumberType):
+            raise ValueError("Shift amount must be a number")
         if not left.signed:
             self.transformer.annotation_issues.append("Signed right shift on unsigned type")
         if right.value == 0:
@@ -637,10 +471,11 @@ class FixedPointOps:
             result_frac_bits = 0
         else:
             result_frac_bits = left.frac_bits - right.value
-        return FixedPointType(left.signed, left.total_bits - right.value, result_frac_bits)
+        return FixedPointType.get(left.signed, left.total_bits - right.value, result_frac_bits)
 
     def shift_right_unsigned_types(self, left, right):
-        assert isinstance(right, NumberType), "Shift amount must be a number"
+        if not isinstance(right, NumberType):
+            raise ValueError("Shift amount must be a number")
         if left.signed:
             self.transformer.annotation_issues.append("unsigned right shift on signed type")
         if right.value == 0:
@@ -649,11 +484,45 @@ class FixedPointOps:
             result_frac_bits = 0
         else:
             result_frac_bits = left.frac_bits - right.value
-        return FixedPointType(left.signed, left.total_bits - right.value, result_frac_bits)
+        return FixedPointType.get(left.signed, left.total_bits - right.value, result_frac_bits)
 
 class FixedPointError(ValueError):
     pass
 
+# Declaration and type patterns, compiled once instead of per line/token
+_REG_DECL_RE = re.compile(r'^\s*reg\s+(signed\s+)?\[(\d+):(\d+)\]\s+(\w+)(\s*\[.*\])?\s*;(\s*//(.*))?')
+_LOCALPARAM_DECL_RE = re.compile(r'^\s*localparam\s+(signed\s+)?\[(\d+):(\d+)\]\s+(\w+)\s*=\s*(.+?)\s*;(\s*//(.*))?')
+_COMMENT_PREFIX_RE = re.compile(r'^\s*//\s*[A-Za-z ]+:\s*')
+_COMMENT_ANNOTATION_RE = re.compile(
+    r'^\s*//\s*(?:(?P<t1>[SU]\d+F\d+)\s+\w+\s*=\s*(?P<e1>.+)$'
+    r'|(?P<e2>.+?)\s*=\s*(?P<t2>[SU]\d+F\d+)$)')
+_ASSIGN_RHS_RE = re.compile(r'(?<![\=!<>])=\s*(.+?)\s*$')
+_IF_COND_RE = re.compile(r'if\s*\(\s*(.+?)\s*\)', re.IGNORECASE)
+_TYPE_RE = re.compile(r'([SU])(\d+)F(\d+)')
+# Trivial-RHS classifier: a lone identifier, unless it would lex as a
+# keyword or carry a leading TYPE annotation
+_SIMPLE_IDENT_RE = re.compile(r'[A-Za-z_]\w*\Z')
+_IDENT_KEYWORD_RE = re.compile(r'abs|signed|[US]\d+F\d+')
+
+
+@dataclass(slots=True)
+class AnalysisResult:
+    """One checked line of a Verilog file. Slots keep the thousands of
+    per-line records produced for a large module compact."""
+    line: int
+    expression: str
+    status: str
+    declared: Optional[FixedPointType] = None
+    computed: Optional[FixedPointType] = None
+    computed_text: Optional[str] = None
+    issues: List[str] = field(default_factory=list)
+    verilog_line: Optional[int] = None
+    verilog_expression: Optional[str] = None
+    verilog_computed: Optional[FixedPointType] = None
+    verilog_issues: Optional[List[str]] = None
+    verilog_status: Optional[str] = None
+
+
 class FixedPointChecker:
     """Checks fixed-point arithmetic expressions"""
 
@@ -661,20 +530,33 @@ class FixedPointChecker:
         # Common Verilog identifiers and their types (can be extended)
         self.known_types = {
             # Common constants
-            'PITCH_REF_C2': FixedPointType(False, 7, 0),  # localparam [6:0] PITCH_REF_C2 = 7'd24;
+            'PITCH_REF_C2': FixedPointType.get(False, 7, 0),  # localparam [6:0] PITCH_REF_C2 = 7'd24;
             # These will be extended by parsing register declarations
         }
         self.known_registers = set()
+        # Evaluated expressions, keyed by expression text; idiomatic RHS
+        # patterns recur many times per file and parse to the same result
+        # as long as known_types is unchanged. Failed evaluations are
+        # stored as the exception to re-raise.
+        self._eval_cache: Dict[str, object] = {}
+        # Shared across all expressions checked by this instance; the
+        # parser resets its per-expression state in parse()
+        self._parser = ExpressionParser(self)
 
     def parse_reg_declaration(self, line: str) -> Optional[Tuple[str, Optional[FixedPointType]]]:
         """Parse a register declaration line like: reg [23:0] note_offset_8x [0:7];  // U24F24
         or: reg signed [7:0] s8_sample;    // S8F7"""
         # Match pattern: reg [signed] [range] name [array]; // comment
-        match = re.match(r'^\s*reg\s+(signed\s+)?\[(\d+):(\d+)\]\s+(\w+)(\s*\[.*\])?\s*;(\s*//(.*))?', line.strip())
+        line = line.strip()
+        if not line.startswith('reg'):
+            return None
+        match = _REG_DECL_RE.match(line)
         if not match:
             return None
 
         signed_str, msb, lsb, name, array_part, comment_part, comment_text = match.groups()
+        # Interned so later identifier lookups reduce to pointer compares
+        name = sys.intern(name)
 
         # Calculate bit width
         total_bits = int(msb) - int(lsb) + 1
@@ -683,33 +565,34 @@ class FixedPointChecker:
         fp_type = None
         if comment_text:
             # Find the type anywhere in the comment
-            type_match = re.search(r'([SU]\d+F\d+)', comment_text)
+            type_match = _TYPE_RE.search(comment_text)
             if type_match:
-                type_str = type_match.group(1)
-                type_match2 = re.match(r'([SU])(\d+)F(\d+)', type_str)
-                if type_match2:
-                    sign_char, declared_total, frac = type_match2.groups()
+                sign_char, declared_total, frac = type_match.groups()
 
-                    # Verify the bit width matches
-                    if int(declared_total) != total_bits:
-                        print(f"Warning: Bit width mismatch for {name}: reg [{msb}:{lsb}] vs {type_str}")
+                # Verify the bit width matches
+                if int(declared_total) != total_bits:
+                    print(f"Warning: Bit width mismatch for {name}: reg [{msb}:{lsb}] vs {type_match.group(0)}")
 
-                    fp_type = FixedPointType(sign_char == 'S', total_bits, int(frac))
+                fp_type = FixedPointType.get(sign_char == 'S', total_bits, int(frac))
 
         # If no explicit type annotation, infer from bit width
         if fp_type is None:
-            fp_type = FixedPointType(signed, total_bits, 0)  # Default to integer type
+            fp_type = FixedPointType.get(signed, total_bits, 0)  # Default to integer type
 
         return name, fp_type
 
     def parse_localparam_declaration(self, line: str) -> Optional[Tuple[str, Optional[FixedPointType]]]:
         """Parse a localparam declaration line like: localparam signed [11:0] FP_0_875 = 12'sd224; // 0.875 in S12F8"""
         # Match pattern: localparam [signed] [range] name = value; // comment
-        match = re.match(r'^\s*localparam\s+(signed\s+)?\[(\d+):(\d+)\]\s+(\w+)\s*=\s*(.+?)\s*;(\s*//(.*))?', line.strip())
+        line = line.strip()
+        if not line.startswith('localparam'):
+            return None
+        match = _LOCALPARAM_DECL_RE.match(line)
         if not match:
             return None
 
         signed_str, msb, lsb, name, value, comment_part, comment_text = match.groups()
+        name = sys.intern(name)
 
         # Calculate bit width
         total_bits = int(msb) - int(lsb) + 1
@@ -718,125 +601,141 @@ class FixedPointChecker:
         fp_type = None
         if comment_text:
             # Find the type anywhere in the comment
-            type_match = re.search(r'([SU]\d+F\d+)', comment_text)
+            type_match = _TYPE_RE.search(comment_text)
             if type_match:
-                type_str = type_match.group(1)
-                type_match2 = re.match(r'([SU])(\d+)F(\d+)', type_str)
-                if type_match2:
-                    sign_char, declared_total, frac = type_match2.groups()
+                sign_char, declared_total, frac = type_match.groups()
 
-                    # Verify the bit width matches
-                    if int(declared_total) != total_bits:
-                        print(f"Warning: Bit width mismatch for {name}: localparam [{msb}:{lsb}] vs {type_str}")
+                # Verify the bit width matches
+                if int(declared_total) != total_bits:
+                    print(f"Warning: Bit width mismatch for {name}: localparam [{msb}:{lsb}] vs {type_match.group(0)}")
 
-                    fp_type = FixedPointType(sign_char == 'S', total_bits, int(frac))
+                fp_type = FixedPointType.get(sign_char == 'S', total_bits, int(frac))
 
         # If no explicit type annotation, infer from bit width
         if fp_type is None:
-            fp_type = FixedPointType(signed, total_bits, 0)  # Default to integer type
+            fp_type = FixedPointType.get(signed, total_bits, 0)  # Default to integer type
 
         return name, fp_type
 
     def build_type_database(self, filename: str):
         """Build the known_types dictionary by parsing register, wire, and localparam declarations"""
+        # Cached evaluations are only valid for one set of known types
+        self._eval_cache.clear()
         with open(filename, 'r') as f:
             for line in f:
+                # Cheap substring check before the declaration regexes;
+                # most lines declare nothing
+                if 'reg' not in line and 'localparam' not in line:
+                    continue
+
                 # Try to parse register declarations
                 reg_result = self.parse_reg_declaration(line)
                 if reg_result:
                     name, fp_type = reg_result
-                    self.known_registers.add(name)
-                    if fp_type:
-                        self.known_types[name] = fp_type
-
-                    # Also add the version without _8x suffix if it exists
-                    if name.endswith('_8x'):
-                        base_name = name[:-3]
-                        self.known_registers.add(base_name)
+                    # An _8x register is also registered under its base
+                    # name; one loop keeps the bookkeeping in one place
+                    names = (name, sys.intern(name[:-3])) if name.endswith('_8x') else (name,)
+                    for n in names:
+                        self.known_registers.add(n)
                         if fp_type:
-                            self.known_types[base_name] = fp_type
-                    continue
-
-                # Try to parse localparam declarations
-                localparam_result = self.parse_localparam_declaration(line)
-                if localparam_result:
-                    name, fp_type = localparam_result
-                    if fp_type:
-                        self.known_types[name] = fp_type
+                            self.known_types[n] = fp_type
                     continue
 
                 # Try to parse localparam declarations
                 localparam_result = self.parse_localparam_declaration(line)
                 if localparam_result:
                     name, fp_type = localparam_result
-                    self.known_registers.add(name)
                     if fp_type:
                         self.known_types[name] = fp_type
 
-                    continue
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
+    def parse_type(type_str: str) -> FixedPointType:
+        """Parse a type string like 'U8F0' or 'S12F11'.
 
-    def parse_type(self, type_str: str) -> FixedPointType:
-        """Parse a type string like 'U8F0' or 'S12F11'"""
-        match = re.match(r'([SU])(\d+)F(\d+)', type_str)
+        Pure function of the string, and the same handful of type names
+        recurs throughout a file, so results are cached. A static method
+        so the cache is keyed on the string alone and shared across
+        checker instances."""
+        match = _TYPE_RE.match(type_str)
         if not match:
             raise ValueError(f"Invalid type format: {type_str}")
 
         sign_char, total, frac = match.groups()
         if sign_char == 'S' and total == frac:
             raise ValueError(f"Invalid signed type: {type_str}")
-        return FixedPointType(sign_char == 'S', int(total), int(frac))
+        return FixedPointType.get(sign_char == 'S', int(total), int(frac))
 
     def parse_comment(self, line: str) -> Optional[Tuple[FixedPointType, str]]:
         """Parse a fixed-point arithmetic comment line"""
-        # Strip descriptive prefixes like "Volume scaling:", "Attack ramp:", etc.
-        line = re.sub(r'^\s*//\s*[A-Za-z ]+:\s*', '// ', line.strip())
-
-        # Match pattern 1: // Type result = expression
-        match1 = re.match(r'^\s*//\s*([SU]\d+F\d+)\s+\w+\s*=\s*(.+)$', line.strip())
-        if match1:
-            result_type_str, full_expression = match1.groups()
-            result_type = self.parse_type(result_type_str)
-            return result_type, full_expression.strip()
-
-        # Match pattern 2: // expression = Type
-        match2 = re.match(r'^\s*//\s*(.+?)\s*=\s*([SU]\d+F\d+)$', line.strip())
-        if match2:
-            full_expression, result_type_str = match2.groups()
-            result_type = self.parse_type(result_type_str)
-            return result_type, full_expression.strip()
-
-        return None
+        line = line.strip()
+        # Strip descriptive prefixes like "Volume scaling:", "Attack ramp:",
+        # etc. — only worth invoking the regex when a colon is present
+        if ':' in line:
+            line = _COMMENT_PREFIX_RE.sub('// ', line)
+
+        # One pass over the line covers both comment shapes:
+        #   // Type result = expression  (t1/e1)
+        #   // expression = Type         (e2/t2)
+        match = _COMMENT_ANNOTATION_RE.match(line)
+        if not match:
+            return None
+        result_type_str = match['t1']
+        if result_type_str is not None:
+            full_expression = match['e1']
+        else:
+            result_type_str = match['t2']
+            full_expression = match['e2']
+        result_type = self.parse_type(result_type_str)
+        return result_type, full_expression.strip()
 
     def evaluate_expression(self, expr: str) -> Tuple[FixedPointType, str, List[str]]:
-        """Evaluate the type of a fixed-point expression using Lark parser"""
+        """Evaluate the type of a fixed-point expression"""
+        cached = self._eval_cache.get(expr)
+        if cached is not None:
+            # Failures are memoized too: the same bad expression often
+            # appears as both the comment and the Verilog RHS
+            if isinstance(cached, Exception):
+                raise type(cached)(*cached.args)
+            computed_type, computed_text, issues = cached
+            # Callers may append to the issue list, so hand out a copy
+            return computed_type, computed_text, list(issues)
+        # Fast path: many annotated RHS strings are a bare known
+        # identifier, which needs no parse machinery at all. Keywords and
+        # TYPE-prefixed names are excluded so lexer priorities still apply.
+        if _SIMPLE_IDENT_RE.fullmatch(expr) and not _IDENT_KEYWORD_RE.match(expr):
+            fp_type = self.known_types.get(expr)
+            if fp_type is not None:
+                self._eval_cache[expr] = (fp_type, expr, ())
+                return fp_type, expr, []
         try:
-            self.parser = Lark(EXPRESSION_GRAMMAR, parser='lalr')
-            tree = self.parser.parse(expr)
-            transformer = TypeTransformer(self)
-            ops = FixedPointOps(False, transformer)
-            transformer.ops = ops
-            result = transformer.transform(tree)
-            # Ensure result is a (FixedPointType, str) tuple
-            if not isinstance(result, tuple) or len(result) != 2:
-                raise ValueError(f"Transformer returned {type(result)} instead of (FixedPointType, str) tuple")
-            computed_type, computed_text = result
-            if not isinstance(computed_type, FixedPointType):
-                raise ValueError(f"Transformer returned {type(computed_type)} instead of FixedPointType")
-            return computed_type, computed_text, transformer.annotation_issues
-        except FixedPointError:
+            # One parser/ops pair lives on the checker; only the issue
+            # list needs resetting between expressions
+            parser = self._parser
+            parser.annotation_issues = []
+            computed_type, computed_text = parser.parse(expr)
+            self._eval_cache[expr] = (computed_type, computed_text, tuple(parser.annotation_issues))
+            return computed_type, computed_text, parser.annotation_issues
+        except FixedPointError as e:
+            self._eval_cache[expr] = e
             raise
-        except VisitError as ve:
-            if isinstance(ve.orig_exc, FixedPointError):
-                raise ve.orig_exc
-            else:
-                raise ValueError(f"Parse error: {str(ve)}")
         except Exception as e:
             #print(f"Parse error for expression: {expr}")
             #traceback.print_exc()
-            raise ValueError(f"Parse error: {str(e)}")
+            error = ValueError(f"Parse error: {str(e)}")
+            self._eval_cache[expr] = error
+            raise error
 
     def check_overflow(self, computed: FixedPointType, declared: FixedPointType) -> List[str]:
         """Check for overflow issues"""
+        # Fast path: most comparisons pass every check, so skip the
+        # message formatting and hand back a shared empty list (callers
+        # only ever concatenate it, never mutate)
+        if (computed.frac_bits == declared.frac_bits
+                and computed.signed == declared.signed
+                and computed.total_bits <= declared.total_bits * 2):
+            return _NO_ISSUES
+
         issues = []
 
         # Allow result to be wider than declared (Verilog truncates)
@@ -859,189 +758,158 @@ class FixedPointChecker:
 
         return issues
 
-    def analyze_file(self, filename: str) -> List[Dict]:
+    def analyze_file(self, filename: str) -> List['AnalysisResult']:
         """Analyze a Verilog file for fixed-point arithmetic issues"""
         # First, build the type database from register declarations
         self.build_type_database(filename)
 
         results = []
 
-        # Read all lines
-        with open(filename, 'r') as f:
-            lines = f.readlines()
-
-        i = 0
+        # Comments successfully evaluated but whose paired Verilog line
+        # has not streamed past yet (blank and comment lines may sit in
+        # between). Their base results are already in `results`; pairing
+        # fills in the verilog_* keys in place, so the file never needs
+        # to be held in memory for lookahead.
+        pending = []
         last_was_comment = False
-        while i < len(lines):
-            line = lines[i]
-            line_num = i + 1
-            if line.strip().startswith('//'):
-                parsed = self.parse_comment(line)
-                if parsed:
-                    declared_type, expression = parsed
-                    try:
-                        computed_type, computed_text, annotation_issues = self.evaluate_expression(expression)
-                        issues = self.check_overflow(computed_type, declared_type) + annotation_issues
-
-                        # Find next Verilog line
-                        j = i + 1
-                        verilog_line = None
-                        verilog_line_num = None
-                        while j < len(lines):
-                            next_line = lines[j].strip()
-                            if next_line and not next_line.startswith('//'):
-                                verilog_line = next_line
-                                verilog_line_num = j + 1
-                                break
-                            j += 1
-
-                        if verilog_line:
-                            verilog_parsed = self.parse_verilog_assignment(verilog_line)
-                            if verilog_parsed:
-                                verilog_lhs, verilog_rhs = verilog_parsed
-                                try:
-                                    verilog_computed, verilog_text, verilog_issues = self.evaluate_expression(verilog_rhs)
-                                    verilog_overflow_issues = self.check_overflow(verilog_computed, declared_type)
-
-                                    # Compare computed types
-                                    if verilog_computed != computed_type:
-                                        verilog_issues.append(f"Verilog type mismatch: comment computed {computed_type}, Verilog computed {verilog_computed}")
-
-                                    result = {
-                                        'line': line_num,
-                                        'expression': expression,
-                                        'computed_text': computed_text,
-                                        'declared': declared_type,
-                                        'computed': computed_type,
-                                        'issues': issues,
-                                        'status': 'OK' if not issues else 'ERROR',
-                                        'verilog_line': verilog_line_num,
-                                        'verilog_expression': verilog_rhs,
-                                        'verilog_computed': verilog_computed,
-                                        'verilog_issues': verilog_overflow_issues + verilog_issues,
-                                        'verilog_status': 'OK' if not (verilog_overflow_issues + verilog_issues) else 'ERROR'
-                                    }
-                                    results.append(result)
-                                except Exception as e:
-                                    result = {
-                                        'line': line_num,
-                                        'expression': expression,
-                                        'computed_text': computed_text,
-                                        'declared': declared_type,
-                                        'computed': computed_type,
-                                        'issues': issues,
-                                        'status': 'OK' if not issues else 'ERROR',
-                                        'verilog_line': verilog_line_num,
-                                        'verilog_expression': verilog_rhs,
-                                        'verilog_computed': None,
-                                        'verilog_issues': [f"Parse error: {str(e)}"],
-                                        'verilog_status': 'PARSE_ERROR'
-                                    }
-                                    results.append(result)
-                            else:
-                                result = {
-                                    'line': line_num,
-                                    'expression': expression,
-                                    'computed_text': computed_text,
-                                    'declared': declared_type,
-                                    'computed': computed_type,
-                                    'issues': issues,
-                                    'status': 'OK' if not issues else 'ERROR'
-                                }
-                                results.append(result)
-                        else:
-                            result = {
-                                'line': line_num,
-                                'expression': expression,
-                                'computed_text': computed_text,
-                                'declared': declared_type,
-                                'computed': computed_type,
-                                'issues': issues,
-                                'status': 'OK' if not issues else 'ERROR'
-                            }
+
+        with open(filename, 'r') as f:
+            for line_num, line in enumerate(f, 1):
+                stripped = line.strip()
+                if stripped.startswith('//'):
+                    parsed = self.parse_comment(stripped)
+                    if parsed:
+                        declared_type, expression = parsed
+                        try:
+                            computed_type, computed_text, annotation_issues = self.evaluate_expression(expression)
+                            issues = self.check_overflow(computed_type, declared_type) + annotation_issues
+                            result = AnalysisResult(
+                                line=line_num,
+                                expression=expression,
+                                computed_text=computed_text,
+                                declared=declared_type,
+                                computed=computed_type,
+                                issues=issues,
+                                status='OK' if not issues else 'ERROR')
                             results.append(result)
-                        last_was_comment = True
-                    except Exception as e:
-                        error_str = str(e)
-                        if "Unknown identifier:" in error_str:
-                            unknown_name = error_str.split("Unknown identifier:")[1].strip()
-                            if unknown_name in self.known_registers:
-                                results.append({
-                                    'line': line_num,
-                                    'expression': expression,
-                                    'declared': declared_type,
-                                    'computed': None,
-                                    'issues': [f"Register '{unknown_name}' is missing type annotation"],
-                                    'status': 'MISSING_TYPE'
-                                })
+                            pending.append(result)
+                        except Exception as e:
+                            error_str = str(e)
+                            if "Unknown identifier:" in error_str:
+                                unknown_name = error_str.split("Unknown identifier:")[1].strip()
+                                if unknown_name in self.known_registers:
+                                    results.append(AnalysisResult(
+                                        line=line_num,
+                                        expression=expression,
+                                        declared=declared_type,
+                                        issues=[f"Register '{unknown_name}' is missing type annotation"],
+                                        status='MISSING_TYPE'))
+                                else:
+                                    results.append(AnalysisResult(
+                                        line=line_num,
+                                        expression=expression,
+                                        declared=declared_type,
+                                        issues=[f"Parse error: {error_str}"],
+                                        status='PARSE_ERROR'))
                             else:
-                                results.append({
-                                    'line': line_num,
-                                    'expression': expression,
-                                    'declared': declared_type,
-                                    'computed': None,
-                                    'issues': [f"Parse error: {error_str}"],
-                                    'status': 'PARSE_ERROR'
-                                })
-                        else:
-                            results.append({
-                                'line': line_num,
-                                'expression': expression,
-                                'declared': declared_type,
-                                'computed': None,
-                                'issues': [f"Parse error: {error_str}"],
-                                'status': 'PARSE_ERROR'
-                            })
+                                results.append(AnalysisResult(
+                                    line=line_num,
+                                    expression=expression,
+                                    declared=declared_type,
+                                    issues=[f"Parse error: {error_str}"],
+                                    status='PARSE_ERROR'))
                         last_was_comment = True
-                else:
-                    last_was_comment = False
-            else:
-                # Non-comment line
+                    else:
+                        last_was_comment = False
+                    continue
+
+                # Non-comment line: pair any waiting comments with it
+                if stripped and pending:
+                    for result in pending:
+                        self._pair_with_verilog(result, stripped, line_num)
+                    pending.clear()
+
                 if last_was_comment:
                     last_was_comment = False
                     # Already handled
                 else:
-                    # Parse as Verilog
-                    verilog_parsed = self.parse_verilog_assignment(line)
-                    if verilog_parsed:
+                    # Parse as Verilog. The substring test is a cheap
+                    # pre-filter: most lines are not assignments, and '='
+                    # also covers '<='
+                    verilog_parsed = self.parse_verilog_assignment(stripped) if '=' in stripped else None
+                    # Only an arithmetic RHS can produce a missing-comment
+                    # report, so test for operators before paying for an
+                    # evaluation
+                    if verilog_parsed and ('+' in verilog_parsed[1] or '-' in verilog_parsed[1]
+                                           or '*' in verilog_parsed[1] or '/' in verilog_parsed[1]):
                         lhs, rhs = verilog_parsed
                         try:
                             computed_type, computed_text, issues = self.evaluate_expression(rhs)
-                            if computed_type.frac_bits > 0 and ('+' in rhs or '-' in rhs or '*' in rhs or '/' in rhs):
-                                result = {
-                                    'line': line_num,
-                                    'expression': rhs,
-                                    'declared': None,
-                                    'computed': computed_type,
-                                    'issues': issues + ['Missing comment for fixed point arithmetic'],
-                                    'status': 'MISSING_COMMENT'
-                                }
+                            if computed_type.frac_bits > 0:
+                                result = AnalysisResult(
+                                    line=line_num,
+                                    expression=rhs,
+                                    computed=computed_type,
+                                    issues=issues + ['Missing comment for fixed point arithmetic'],
+                                    status='MISSING_COMMENT')
                                 results.append(result)
                         except Exception as e:
                             # Silently eat
                             pass
-                    else:
-                        # Silently eat
-                        pass
-            i += 1
+
         return results
 
+    def _pair_with_verilog(self, result: 'AnalysisResult', verilog_line: str, verilog_line_num: int):
+        """Check a comment's computed type against the Verilog assignment
+        that follows it, updating the comment's result in place"""
+        verilog_parsed = self.parse_verilog_assignment(verilog_line)
+        if not verilog_parsed:
+            return
+
+        verilog_lhs, verilog_rhs = verilog_parsed
+        declared_type = result.declared
+        computed_type = result.computed
+        # The comment usually documents the very assignment it precedes;
+        # when the two expressions match modulo whitespace, evaluate the
+        # comment's exact string so the memo cache answers directly
+        eval_key = verilog_rhs
+        if verilog_rhs.split() == result.expression.split():
+            eval_key = result.expression
+        try:
+            verilog_computed, verilog_text, verilog_issues = self.evaluate_expression(eval_key)
+            verilog_overflow_issues = self.check_overflow(verilog_computed, declared_type)
+
+            # Compare computed types
+            if verilog_computed != computed_type:
+                verilog_issues.append(f"Verilog type mismatch: comment computed {computed_type}, Verilog computed {verilog_computed}")
+
+            result.verilog_line = verilog_line_num
+            result.verilog_expression = verilog_rhs
+            result.verilog_computed = verilog_computed
+            result.verilog_issues = verilog_overflow_issues + verilog_issues
+            result.verilog_status = 'OK' if not result.verilog_issues else 'ERROR'
+        except Exception as e:
+            result.verilog_line = verilog_line_num
+            result.verilog_expression = verilog_rhs
+            result.verilog_issues = [f"Parse error: {str(e)}"]
+            result.verilog_status = 'PARSE_ERROR'
+
     def parse_verilog_assignment(self, line: str) -> Optional[Tuple[str, str]]:
         """Parse a Verilog assignment line like: lhs <= rhs; or lhs = rhs;
         Returns (lhs, rhs) or None if not an assignment"""
         # Remove trailing comment, semicolon and whitespace
-        line, _ = line.split('//', 1) if '//' in line else (line, '')
-        line = line.strip().rstrip(';')
+        line = line.partition('//')[0].strip().rstrip(';')
 
-        # Try non-blocking assignment first (<=)
-        if '<=' in line:
-            lhs, rhs = line.split('<=', 1)
-            return lhs.strip(), rhs.strip()
+        # Try non-blocking assignment first (<=), splitting on the index
+        # so the line is scanned once per operator
+        idx = line.find('<=')
+        if idx >= 0:
+            return line[:idx].strip(), line[idx + 2:].strip()
 
         # Try blocking assignment (=)
-        elif '=' in line:
-            lhs, rhs = line.split('=', 1)
-            return lhs.strip(), rhs.strip()
+        idx = line.find('=')
+        if idx >= 0:
+            return line[:idx].strip(), line[idx + 1:].strip()
 
         return None
 
@@ -1072,12 +940,12 @@ class FixedPointChecker:
                 rhs = parts[1].strip()
                 return rhs if rhs else None
         elif '=' in line and not line.startswith('='):
-            match = re.search(r'(?<![\=!<>])=\s*(.+?)\s*$', line)
+            match = _ASSIGN_RHS_RE.search(line)
             if match:
                 return match.group(1).strip()
 
         # For if statements: if (condition)
-        match = re.search(r'if\s*\(\s*(.+?)\s*\)', line, re.IGNORECASE)
+        match = _IF_COND_RE.search(line)
         if match:
             cond = match.group(1).strip()
             if cond:
@@ -1085,17 +953,17 @@ class FixedPointChecker:
 
         # For other expressions, return the line
         return line
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python fixed_point_checker.py <verilog_file>")
-        sys.exit(1)
+def check_file(filename: str) -> str:
+    """Analyze a single Verilog file and render its report.
 
-    filename = sys.argv[1]
+    Returns the report text instead of printing so that files can be
+    analyzed in worker processes and emitted in command-line order."""
     checker = FixedPointChecker()
     results = checker.analyze_file(filename)
 
-    print(f"Fixed-Point Arithmetic Analysis for {filename}")
-    print("=" * 60)
+    out = []
+    out.append(f"Fixed-Point Arithmetic Analysis for {filename}")
+    out.append("=" * 60)
 
     ok_count = 0
     error_count = 0
@@ -1104,7 +972,7 @@ def main():
     missing_comment_count = 0
 
     for result in results:
-        status = result['status']
+        status = result.status
         if status == 'OK':
             ok_count += 1
         elif status == 'ERROR':
@@ -1116,33 +984,52 @@ def main():
         elif status == 'MISSING_COMMENT':
             missing_comment_count += 1
 
-        print(f"Line {result['line']}: {status}")
-        if result['expression']:
-            print(f"  Expression: {result['expression']}")
-        if result['declared']:
-            print(f"  Declared: {result['declared']}")
-        if result['computed']:
-            print(f"  Computed: {result['computed']}")
-        if result['issues']:
-            for issue in result['issues']:
-                print(f"  {issue}")
-
-        # Print Verilog analysis if present
-        if 'verilog_line' in result:
-            print(f"  Verilog Line {result['verilog_line']}: {result.get('verilog_status', 'UNKNOWN')}")
-            if result.get('verilog_expression'):
-                print(f"    Expression: {result['verilog_expression']}")
-            if result.get('verilog_computed'):
-                print(f"    Verilog Computed: {result['verilog_computed']}")
-            if result.get('verilog_issues'):
-                for issue in result['verilog_issues']:
-                    print(f"    {issue}")
-
-        print()
-
-    print("=" * 60)
-    print(f"Summary: {ok_count} OK, {error_count} Errors, {parse_error_count} Parse Errors, {missing_type_count} Missing Types, {missing_comment_count} Missing Comments")
-    print(f"Total fixed-point expressions checked: {len(results)}")
+        out.append(f"Line {result.line}: {status}")
+        if result.expression:
+            out.append(f"  Expression: {result.expression}")
+        if result.declared:
+            out.append(f"  Declared: {result.declared}")
+        if result.computed:
+            out.append(f"  Computed: {result.computed}")
+        if result.issues:
+            for issue in result.issues:
+                out.append(f"  {issue}")
+
+        # Include Verilog analysis if present
+        if result.verilog_line is not None:
+            out.append(f"  Verilog Line {result.verilog_line}: {result.verilog_status or 'UNKNOWN'}")
+            if result.verilog_expression:
+                out.append(f"    Expression: {result.verilog_expression}")
+            if result.verilog_computed:
+                out.append(f"    Verilog Computed: {result.verilog_computed}")
+            if result.verilog_issues:
+                for issue in result.verilog_issues:
+                    out.append(f"    {issue}")
+
+        out.append("")
+
+    out.append("=" * 60)
+    out.append(f"Summary: {ok_count} OK, {error_count} Errors, {parse_error_count} Parse Errors, {missing_type_count} Missing Types, {missing_comment_count} Missing Comments")
+    out.append(f"Total fixed-point expressions checked: {len(results)}")
+
+    return "\n".join(out) + "\n"
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python fixed_point_checker.py <verilog_file> [<verilog_file> ...]")
+        sys.exit(1)
+
+    files = sys.argv[1:]
+    if len(files) == 1:
+        sys.stdout.write(check_file(files[0]))
+        return
+
+    # Each file is analyzed independently, so farm them out to worker
+    # processes and print the reports in command-line order.
+    with ProcessPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as executor:
+        for report in executor.map(check_file, files):
+            sys.stdout.write(report)
 
 
 if __name__ == "__main__":
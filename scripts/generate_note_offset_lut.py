@@ -12,17 +12,22 @@ For speed_byte = 1 to 255:
 This ensures note_offset reaches exactly 2^24 after speed_byte ticks.
 """
 
-def calculate_note_offset_inc(speed_byte):
-    """Calculate note_offset increment for a given speed_byte."""
-    if speed_byte == 0:
-        return 0  # Not used, but included for completeness
-    return (1 << 24) // (183 * speed_byte)
+import sys
+
+import numpy as np
+
+def calculate_note_offset_incs():
+    """Calculate note_offset increments for speed_byte 0..255 in one shot."""
+    speed = np.arange(256)
+    # speed_byte 0 is not used, but included for completeness
+    incs = np.where(speed == 0, 0, (1 << 24) // (183 * np.maximum(speed, 1)))
+    return incs.tolist()
 
 def main():
     print("Generating note_offset_lut values...")
-    
+
     # Generate table for speed_byte 0..255
-    entries = [calculate_note_offset_inc(i) for i in range(256)]
+    entries = calculate_note_offset_incs()
     
     # Print some key values for verification
     print(f"speed_byte  0: increment = {entries[0]} (not used)")
@@ -42,16 +47,18 @@ def main():
         print(f"speed {speed:3d}: {entries[speed]:8d} * (183 * {speed:3d}) = {product:8d} (error: {error})")
     print()
     
-    # Generate Verilog table
-    print("// note_offset_lut for U17F24 fixed-point envelope effects")
-    print("// note_offset increments per tick for each speed_byte value")
-    print("// increment = 2^24 // (183 * speed_byte) (183 ticks per second at 22050 Hz)")
-    print("// Top 7 bits are always 0, so we use U17F24 format")
-    print("reg [16:0] note_offset_lut [0:255];")
-    print("initial begin")
-    print("    note_offset_lut[  0] = 17'h1ffff;  // Special value, not used")
-    
-    # Print in groups of 4 for readability
+    # Generate Verilog table: build the whole block and emit it once
+    chunks = [
+        "// note_offset_lut for U17F24 fixed-point envelope effects",
+        "// note_offset increments per tick for each speed_byte value",
+        "// increment = 2^24 // (183 * speed_byte) (183 ticks per second at 22050 Hz)",
+        "// Top 7 bits are always 0, so we use U17F24 format",
+        "reg [16:0] note_offset_lut [0:255];",
+        "initial begin",
+        "    note_offset_lut[  0] = 17'h1ffff;  // Special value, not used",
+    ]
+
+    # Format in groups of 4 for readability
     for i in range(1, 256, 4):
         line = f"    note_offset_lut[{i:3d}] = 17'h{entries[i]:05x};"
         if i+1 < 256:
@@ -60,9 +67,10 @@ def main():
             line += f"   note_offset_lut[{i+2:3d}] = 17'h{entries[i+2]:05x};"
         if i+3 < 256:
             line += f"   note_offset_lut[{i+3:3d}] = 17'h{entries[i+3]:05x};"
-        print(line)
-    
-    print("end")
+        chunks.append(line)
+
+    chunks.append("end")
+    sys.stdout.write('\n'.join(chunks) + '\n')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
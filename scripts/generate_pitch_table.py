@@ -14,26 +14,30 @@ Phase accumulator:
 """
 
 import math
+import sys
+
+import numpy as np
 
 SAMPLE_RATE = 22050
 PHASE_BITS = 18
 REFERENCE_FREQ = 440.0
 REFERENCE_NOTE = 33
 
-def calculate_phase_inc(note):
-    """Calculate phase increment for a given PICO-8 pitch (note number)."""
+def calculate_phase_incs():
+    """Calculate phase increments for PICO-8 pitches 0..95 in one shot."""
     # Formula: freq = 440 * 2^((note - 33) / 12)
     # note 0 = C0 = 16.35Hz
     # note 24 = C2 = 65.41Hz
     # note 33 = A2 = 110Hz
     # note 57 = A4 = 440 Hz
-    freq = REFERENCE_FREQ * math.pow(2.0, (note - REFERENCE_NOTE) / 12.0)
-    phase_inc = (math.pow(2, PHASE_BITS) * freq) / SAMPLE_RATE
-    return int(phase_inc)
+    notes = np.arange(96)
+    freq = REFERENCE_FREQ * np.exp2((notes - REFERENCE_NOTE) / 12.0)
+    phase_inc = (2 ** PHASE_BITS * freq) / SAMPLE_RATE
+    return phase_inc.astype(np.int64).tolist()
 
 def main():
     # Generate table for PICO-8 pitches 0..95
-    entries = [calculate_phase_inc(i) for i in range(96)]
+    entries = calculate_phase_incs()
     
     # Print some key frequencies for verification
     print(f"Note  0 (C0): {REFERENCE_FREQ * math.pow(2.0, (0 - REFERENCE_NOTE) / 12.0):.2f} Hz -> 0x{entries[0]:08x} ({entries[0]})")
@@ -59,17 +63,20 @@ def main():
     print(f"Note 72->84: ratio {entries[84] / entries[72]:.6f}")
     print()
     
-    # Generate Verilog table
-    print("// Pitch table (32-bit fixed-point phase increments for PICO-8 pitches 0..95)")
-    print("// PICO-8 pitch 0 = C0, pitch 24 = C2, pitch 57 = A4 (440 Hz)")
-    print("// phase_inc = (2^12 * freq) / 22050; freq = 440*2^((note-33)/12)")
-    print(f"reg [{PHASE_BITS-1}:0] pitch_phase_inc [0:95];")
-    print("initial begin")
-    
+    # Generate Verilog table: build the whole block and emit it once
+    chunks = [
+        "// Pitch table (32-bit fixed-point phase increments for PICO-8 pitches 0..95)",
+        "// PICO-8 pitch 0 = C0, pitch 24 = C2, pitch 57 = A4 (440 Hz)",
+        "// phase_inc = (2^12 * freq) / 22050; freq = 440*2^((note-33)/12)",
+        f"reg [{PHASE_BITS-1}:0] pitch_phase_inc [0:95];",
+        "initial begin",
+    ]
+
     for i in range(0, 96, 2):
-        print(f"    pitch_phase_inc[{i:2d}] = {PHASE_BITS}'h{entries[i]:04x}; pitch_phase_inc[{i+1:2d}] = {PHASE_BITS}'h{entries[i+1]:04x};")
-    
-    print("end")
+        chunks.append(f"    pitch_phase_inc[{i:2d}] = {PHASE_BITS}'h{entries[i]:04x}; pitch_phase_inc[{i+1:2d}] = {PHASE_BITS}'h{entries[i+1]:04x};")
+
+    chunks.append("end")
+    sys.stdout.write('\n'.join(chunks) + '\n')
 
 if __name__ == "__main__":
     main()